@@ -1,6 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from gait.polyfit import evaluate_polynomials, fit_polynomials
+
 # Given signal data
 signal = [1.28, 1.41, 1.16, 0.41, -0.48, -0.99, -0.66, 0.31, 1.09, 1.09, 
           0.33, -0.74, -1.71, -2.48, -3.11, -3.7, -4.35, -4.98, -5.28, 
@@ -12,11 +14,11 @@ signal = [1.28, 1.41, 1.16, 0.41, -0.48, -0.99, -0.66, 0.31, 1.09, 1.09,
 # Generate time vector matching the signal length
 t = np.linspace(0, 5, len(signal))  # Create a time vector
 
-# Fit a 20th-degree polynomial to the data
-p = np.polyfit(t, signal, 35)
+# Fit a 35th-degree polynomial to the data (scaled Chebyshev basis, QR solve)
+p = fit_polynomials(t, signal, 35)
 
 # Evaluate the polynomial at the time points
-reconstructed_signal = np.polyval(p, t)
+reconstructed_signal = evaluate_polynomials(p, t)
 
 # Plot the original signal and the fitted curve
 plt.figure(figsize=(10, 6))
@@ -1,6 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from gait.fourier import fourier_coefficients, fourier_reconstruct
+
 # Given signal data
 signal = [1.28, 1.41, 1.16, 0.41, -0.48, -0.99, -0.66, 0.31, 1.09, 1.09,
           0.33, -0.74, -1.71, -2.48, -3.11, -3.7, -4.35, -4.98, -5.28, -4.96,
@@ -11,22 +13,12 @@ signal = [1.28, 1.41, 1.16, 0.41, -0.48, -0.99, -0.66, 0.31, 1.09, 1.09,
 # Time vector
 t = np.linspace(0, 5, len(signal))  # Generate time vector
 
-# Fourier Transform
-N = len(signal)  # Number of data points
-Y = np.fft.fft(signal)  # Compute FFT
-frequencies = np.fft.fftfreq(N, d=(t[1] - t[0]))  # Frequencies
-amplitudes = np.abs(Y) / N  # Amplitudes of Fourier components
-
-# Reconstruct signal using limited Fourier terms
+# Fourier series coefficients (DC term plus the first harmonics)
 num_terms = 20  # Choose the number of Fourier terms to use
-reconstructed_signal = np.zeros_like(t)
+coefficients = fourier_coefficients(signal, n_terms=num_terms - 1)
 
-for k in range(num_terms):
-    amplitude = 2 * np.abs(Y[k]) / N  # Amplitude scaling
-    phase = np.angle(Y[k])  # Phase
-    frequency = frequencies[k]  # Frequency
-    # Add the Fourier term to the reconstruction
-    reconstructed_signal += amplitude * np.cos(2 * np.pi * frequency * t + phase)
+# Reconstruct signal using limited Fourier terms (one matrix multiply with a cached basis)
+reconstructed_signal = fourier_reconstruct(coefficients, len(signal))
 
 # Plot the original and reconstructed signal
 plt.figure(figsize=(10, 6))
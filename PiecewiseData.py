@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from numpy.polynomial.polynomial import Polynomial
+
+from gait.piecewise import evaluate_piecewise, fit_piecewise
 
 # Given signal data
 signal = [1.28, 1.41, 1.16, 0.41, -0.48, -0.99, -0.66, 0.31, 1.09, 1.09,
@@ -13,23 +14,12 @@ signal = [1.28, 1.41, 1.16, 0.41, -0.48, -0.99, -0.66, 0.31, 1.09, 1.09,
 t = np.linspace(0, 5, len(signal))  # Generate time vector
 
 # --- Piecewise Polynomial Approximation ---
-# Define segment boundaries
+# Define segment boundaries (in seconds, any number of segments)
 segments = [0, 1, 2, 3, 4, 5]  # Divide into 5 equal segments
-reconstructed_piecewise = np.zeros_like(t)
-
-# Fit polynomials to each segment
-for i in range(len(segments) - 1):
-    # Determine the indices for the current segment
-    start_idx = int(segments[i] * len(signal) / 5)
-    end_idx = int(segments[i + 1] * len(signal) / 5)
-    
-    # Extract the time and signal data for the current segment
-    t_seg = t[start_idx:end_idx]
-    signal_seg = signal[start_idx:end_idx]
-    
-    # Fit a 3rd-degree polynomial to the segment
-    p = Polynomial.fit(t_seg, signal_seg, deg=3)
-    reconstructed_piecewise[start_idx:end_idx] = p(t_seg)
+
+# Fit a 3rd-degree polynomial to every segment in one least-squares solve
+p = fit_piecewise(t, signal, segments, degree=3)
+reconstructed_piecewise = evaluate_piecewise(p, t)
 
 # --- Plot the Results ---
 plt.figure(figsize=(10, 6))
@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d
+
+from gait.splinecache import cached_spline
 
 # Given signal data
 signal = [1.28, 1.41, 1.16, 0.41, -0.48, -0.99, -0.66, 0.31, 1.09, 1.09, 
@@ -15,8 +16,8 @@ t = np.linspace(0, 5, len(signal))  # Create a time vector
 
 # Perform cubic spline interpolation
 original_t = np.linspace(0, 5, len(signal))  # Original time vector based on signal length
-spline_interp = interp1d(original_t, signal, kind='cubic')  # Cubic spline interpolation
-reconstructed_signal = spline_interp(t)  # Interpolated values at the new time points
+spline_interp = cached_spline(original_t, signal)  # Cubic spline interpolation (fitted lazily, memoized)
+reconstructed_signal = spline_interp(t)  # Interpolated values (t is the knot grid, so nothing is fitted)
 
 # Plot the original signal and the fitted spline curve
 plt.figure(figsize=(10, 6))
@@ -0,0 +1,81 @@
+# Throughput of vectorized inverse dynamics over (cycles x frames)
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait.data import joint_angles
+from gait.dynamics import anthropometric_segments, joint_torques, leg_torques
+from gait.reconstruction import reconstruct
+
+n_cycles = 2000       # Gait cycles in the cohort
+n_interp = 500        # Frames per cycle
+cycle_duration = 1.1  # Seconds per cycle
+
+rng = np.random.default_rng(0)
+angles = joint_angles()[None] + rng.normal(0, 0.5, (n_cycles, 4, 51))
+recon = reconstruct(angles, n_interp=n_interp)
+segments = anthropometric_segments()
+
+
+def frame_loop(n):
+    # Scalar Python loop, one frame at a time, as a per-frame script would do it
+    m1, m2, L1, L2, l1, l2, I1, I2 = segments
+    g = 9.81
+    theta = recon.radians[:n]
+    omega = recon.velocity[:n] / cycle_duration
+    alpha = recon.acceleration[:n] / cycle_duration ** 2
+    out = np.empty((n, 2, 2, n_interp))
+    for c in range(n):
+        for leg in range(2):
+            for f in range(n_interp):
+                a, b = theta[c, leg, f], theta[c, leg + 2, f]
+                wa, wb = omega[c, leg, f], omega[c, leg + 2, f]
+                aa, ab = alpha[c, leg, f], alpha[c, leg + 2, f]
+                mass = np.array([[I1 + m1 * l1 ** 2 + m2 * L1 ** 2, m2 * L1 * l2 * np.cos(a - b)],
+                                 [m2 * L1 * l2 * np.cos(a - b), I2 + m2 * l2 ** 2]])
+                bias = np.array([m2 * L1 * l2 * np.sin(a - b) * wb ** 2 + (m1 * l1 + m2 * L1) * g * np.sin(a),
+                                 -m2 * L1 * l2 * np.sin(a - b) * wa ** 2 + m2 * l2 * g * np.sin(b)])
+                q = mass @ np.array([aa, ab]) + bias
+                out[c, 0, leg, f] = q[0] + q[1]
+                out[c, 1, leg, f] = q[1]
+    return out
+
+
+# Both paths must agree before timing them
+n_loop = 20
+hip, knee = leg_torques(recon, segments, cycle_duration)
+loop = frame_loop(n_loop)
+assert np.allclose(hip[:n_loop], loop[:, 0]) and np.allclose(knee[:n_loop], loop[:, 1])
+
+# Static check: a horizontal leg at rest holds exactly the gravity moment
+m1, m2, L1, L2, l1, l2, I1, I2 = segments
+h, k = joint_torques(np.pi / 2, np.pi / 2, 0, 0, 0, 0, segments)
+assert np.isclose(h, (m1 * l1 + m2 * L1 + m2 * l2) * 9.81) and np.isclose(k, m2 * l2 * 9.81)
+
+start = time.perf_counter()
+frame_loop(n_loop)
+elapsed = time.perf_counter() - start
+print(f"{'frame loop':20s} {elapsed:8.3f} s  {n_loop / elapsed:10.0f} cycles/s")
+
+start = time.perf_counter()
+leg_torques(recon, segments, cycle_duration)
+elapsed = time.perf_counter() - start
+print(f"{'vectorized':20s} {elapsed:8.3f} s  {n_cycles / elapsed:10.0f} cycles/s  "
+      f"{n_cycles * n_interp * 2 / elapsed / 1e6:6.1f} M leg-frames/s")
+
+# A sweep over body sizes broadcasts as a leading axis, no loop needed
+sizes = anthropometric_segments(np.linspace(50, 100, 8)[:, None, None, None],
+                                np.linspace(1.5, 2.0, 8)[:, None, None, None])
+start = time.perf_counter()
+hip, knee = leg_torques(recon, sizes, cycle_duration)
+elapsed = time.perf_counter() - start
+print(f"{'8 body sizes':20s} {elapsed:8.3f} s  {8 * n_cycles / elapsed:10.0f} cycles/s  {hip.shape}")
+
+# Peak torques of the (unjittered) sample cycle, left and right leg
+hip, knee = leg_torques(reconstruct(joint_angles()[None], n_interp=n_interp), segments, cycle_duration)
+print("peak hip torque (N m) ", np.abs(hip[0]).max(axis=-1).round(1))
+print("peak knee torque (N m)", np.abs(knee[0]).max(axis=-1).round(1))
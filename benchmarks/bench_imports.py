@@ -0,0 +1,34 @@
+# Cold-start cost of a worker process: script-style imports vs. the gait package
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+repeats = 7  # Fresh interpreters per case; the fastest one is reported
+
+cases = {
+    "python only": "pass",
+    "numpy": "import numpy",
+    "script header": "import numpy, matplotlib.pyplot, scipy.interpolate, scipy.integrate",
+    "gait modules": "import gait.reconstruction, gait.kinematics, gait.fourier, gait.polyfit, "
+                    "gait.piecewise, gait.pendulum, gait.periodic",
+    "gait + fourier fit": "import gait; gait.fourier_coefficients(gait.joint_angles(), 8)",
+    "gait + reconstruct": "import gait; gait.reconstruct(gait.joint_angles())",
+}
+
+report = "import sys; print(len(sys.modules), 'scipy' in sys.modules, 'matplotlib' in sys.modules)"
+env = dict(os.environ, PYTHONPATH=str(root), MPLBACKEND="Agg")
+
+print(f"{'case':20s} {'seconds':>8s} {'modules':>8s}  scipy  matplotlib")
+for name, code in cases.items():
+    best = float("inf")
+    for _ in range(repeats):
+        # Time the whole interpreter run, as a process pool or batch scheduler sees it
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", f"{code}\n{report}"], env=env, cwd=root,
+                             capture_output=True, text=True, check=True).stdout
+        best = min(best, time.perf_counter() - start)
+    modules, scipy, matplotlib = out.split()
+    print(f"{name:20s} {best:8.3f} {modules:>8s}  {scipy:5s}  {matplotlib}")
@@ -0,0 +1,48 @@
+# Peak memory and throughput of streaming reconstruction over long recordings
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait.data import joint_angles
+from gait.loaders import iter_blocks, iter_windows
+from gait.reconstruction import reconstruct
+
+block_size = 65536
+window = 51  # Samples per cycle, as in the hard-coded lists
+batch = 256  # Cycles reconstructed per call
+
+cycle = joint_angles().T  # (51 x 4), one row per sample
+rng = np.random.default_rng(0)
+
+with tempfile.TemporaryDirectory() as tmp:
+    for n_cycles in [10_000, 100_000]:
+        recording = np.tile(cycle, (n_cycles, 1)) + rng.normal(0, 0.2, (n_cycles * window, 4))
+        paths = {"npy": os.path.join(tmp, "rec.npy")}
+        np.save(paths["npy"], recording)
+        if n_cycles <= 10_000:
+            # Text export is slow to write, so only the smaller recording gets one
+            paths["csv"] = os.path.join(tmp, "rec.csv")
+            np.savetxt(paths["csv"], recording, delimiter=",", header="left_hip,right_hip,left_knee,right_knee",
+                       comments="", fmt="%.3f")
+        file_mb = recording.nbytes / 1e6
+        del recording
+
+        for kind, path in paths.items():
+            tracemalloc.start()
+            start = time.perf_counter()
+            done = 0
+            for cycles in iter_windows(iter_blocks(path, block_size), window, batch):
+                reconstruct(cycles, n_interp=500)
+                done += len(cycles)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+            print(f"{kind}  {n_cycles:7d} cycles ({file_mb:6.1f} MB of float64)  "
+                  f"{done / elapsed:8.0f} cycles/s  peak {peak:6.1f} MB")
@@ -0,0 +1,170 @@
+# Speed, memory and accuracy of the spline, Fourier, polynomial and piecewise reconstructions
+#
+# Runs every method on synthetic periodic cycles across input lengths and
+# batch sizes, plus the real 51-sample cycles, and writes one JSON record per
+# run so results can be compared between commits:
+#
+#   python benchmarks/bench_methods.py --output bench_methods.json
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import scipy
+from scipy.interpolate import CubicSpline
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait import piecewise, polyfit
+from gait.data import joint_angles, signal
+from gait.fourier import fourier_basis, fourier_coefficients, fourier_reconstruct
+from gait.piecewise import evaluate_piecewise, fit_piecewise
+from gait.polyfit import evaluate_polynomials, fit_polynomials
+
+# Per-grid factorizations cached by the fitters; cleared before every cold run
+CACHES = [polyfit._qr, piecewise._segment_basis, piecewise._solver, fourier_basis]
+
+
+# Each method is (fit(t, y) -> model, evaluate(model, t) -> values), batched over y's leading axes
+def _spline_fit(t, y):
+    return CubicSpline(t, y, axis=-1)
+
+
+def _spline_eval(model, t):
+    return model(t)
+
+
+def _fourier_fit(t, y):
+    # The grid includes the cycle end point, as np.linspace(0, 1, n) does; it
+    # repeats the first sample, so it is left out of the DFT
+    return fourier_coefficients(y[..., :-1], n_terms=min(20, (len(t) - 1) // 2))
+
+
+def _fourier_eval(model, t):
+    # Series evaluated at arbitrary times in cycles, so held-out samples work too
+    a0, an, bn = model
+    kx = 2 * np.pi * np.arange(1, an.shape[-1] + 1)[:, None] * t
+    return np.asarray(a0)[..., None] + an @ np.cos(kx) + bn @ np.sin(kx)
+
+
+def _polynomial_fit(t, y):
+    return fit_polynomials(t, y, 15)
+
+
+def _piecewise_fit(t, y):
+    return fit_piecewise(t, y, np.linspace(0, 1, 6), degree=3, continuity=1)
+
+
+METHODS = {
+    "spline": (_spline_fit, _spline_eval),
+    "fourier": (_fourier_fit, _fourier_eval),
+    "polynomial": (_polynomial_fit, evaluate_polynomials),
+    "piecewise": (_piecewise_fit, evaluate_piecewise),
+}
+
+
+def synthetic_cycles(n_samples, batch, rng, noise=0.1):
+    """Noisy periodic cycles built from the sample hip-rotation harmonics, plus the clean truth."""
+    a0, an, bn = fourier_coefficients(np.asarray(signal[:-1]), n_terms=10)
+    scale = rng.normal(1, 0.1, (batch, 1))
+    truth = fourier_reconstruct((a0 * scale[:, 0], an * scale, bn * scale), n_samples, endpoint=True)
+    return truth + rng.normal(0, noise, truth.shape), truth
+
+
+def run(method, t, y, truth, t_eval=None):
+    """Fit on (t, y) and compare the evaluation at `t_eval` (default `t`) with `truth`.
+
+    The fit is timed twice: cold, with the fitters' caches cleared, and warm,
+    reusing the factorization of the same grid.
+    """
+    fit, evaluate = METHODS[method]
+    t_eval = t if t_eval is None else t_eval
+    for cache in CACHES:
+        cache.cache_clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+    model = fit(t, y)
+    fitted = time.perf_counter()
+    values = evaluate(model, t_eval)
+    done = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    warm = time.perf_counter()
+    fit(t, y)
+    warm = time.perf_counter() - warm
+    error = values - truth
+    return {
+        "method": method,
+        "n_samples": len(t),
+        "batch": int(np.prod(y.shape[:-1])),
+        "fit_seconds": fitted - start,
+        "fit_warm_seconds": warm,
+        "evaluate_seconds": done - fitted,
+        "peak_bytes": peak,
+        "rmse": float(np.sqrt(np.mean(error ** 2))),
+        "max_error": float(np.abs(error).max()),
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[51, 501, 5001, 50_001, 1_000_001])
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--max-elements", type=int, default=20_000_000,
+                        help="skip length x batch combinations larger than this")
+    parser.add_argument("--output", help="write the JSON results here")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    records = []
+
+    # Real cycles: fit every other sample and predict the held-out ones in between
+    real = {"hip_rotation": np.asarray(signal, dtype=float), "joints": joint_angles()}
+    t = np.linspace(0, 1, 51)
+    for name, y in real.items():
+        for method in METHODS:
+            records.append(dict(run(method, t[::2], y[..., ::2], y[..., 1::2], t[1::2]), data=name))
+
+    # Synthetic cycles: error against the noise-free signal
+    for n_samples in args.lengths:
+        t = np.linspace(0, 1, n_samples)
+        for batch in args.batches:
+            if n_samples * batch > args.max_elements:
+                continue
+            y, truth = synthetic_cycles(n_samples, batch, rng)
+            for method in METHODS:
+                records.append(dict(run(method, t, y, truth), data="synthetic"))
+
+    for r in records:
+        print(f"{r['data']:12s} {r['method']:10s} n={r['n_samples']:8d} batch={r['batch']:6d}  "
+              f"fit {r['fit_seconds'] * 1e3:9.2f} ms (warm {r['fit_warm_seconds'] * 1e3:9.2f})  eval {r['evaluate_seconds'] * 1e3:9.2f} ms  "
+              f"peak {r['peak_bytes'] / 1e6:8.1f} MB  rmse {r['rmse']:.4f}  max {r['max_error']:.4f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "results": records}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# float32 vs. float64 reconstruction and kinematics: error, throughput and memory
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait.data import joint_angles
+from gait.kinematics import forward_kinematics
+from gait.precision import compare_precision
+from gait.reconstruction import reconstruct
+
+n_cycles = 2000  # Gait cycles in the cohort
+n_interp = 500   # Evaluation grid used by simul.py
+
+rng = np.random.default_rng(0)
+angles = joint_angles()[None] + rng.normal(0, 0.5, (n_cycles, 4, 51))
+
+
+def run(dtype):
+    recon = reconstruct(angles, n_interp, dtype=dtype)
+    positions = forward_kinematics(recon.radians[:, :2], recon.radians[:, 2:])
+    return recon, positions
+
+
+# Every output must stay in the requested precision
+for dtype in (np.float64, np.float32):
+    recon, positions = run(dtype)
+    assert all(a.dtype == dtype for a in recon + positions), dtype
+
+report = compare_precision(angles, n_interp)
+print(f"max angle error     {report.angle_error:.2e} deg")
+print(f"max velocity error  {report.velocity_error:.2e} (relative)")
+print(f"max accel. error    {report.acceleration_error:.2e} (relative)")
+print(f"max position error  {report.position_error:.2e} m (L1 = L2 = 1 m)")
+assert report.angle_error < 1e-3 and report.position_error < 1e-5
+
+results = {}
+for dtype in (np.float64, np.float32):
+    run(dtype)  # Warm up
+    start = time.perf_counter()
+    for _ in range(3):
+        run(dtype)
+    elapsed = (time.perf_counter() - start) / 3
+    tracemalloc.start()
+    run(dtype)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    results[dtype] = elapsed, peak
+    print(f"{np.dtype(dtype).name:8s} {elapsed:8.3f} s  {n_cycles / elapsed:10.0f} cycles/s  "
+          f"peak {peak / 2 ** 20:7.1f} MiB")
+
+(t64, m64), (t32, m32) = results[np.float64], results[np.float32]
+print(f"float32: x{t64 / t32:.2f} throughput, x{m64 / m32:.2f} less peak memory, "
+      f"outputs {report.nbytes / 2 ** 20:.1f} vs {report.nbytes_float64 / 2 ** 20:.1f} MiB")
@@ -0,0 +1,60 @@
+# Cost of the profiling hooks when off and when recording
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait import profiling
+from gait.data import joint_angles
+from gait.reconstruction import reconstruct
+
+n_calls = 200000
+
+
+def hooks():
+    for _ in range(n_calls):
+        with profiling.timer("bench.timer"):
+            pass
+        profiling.count("bench.count")
+
+
+def bare():
+    for _ in range(n_calls):
+        pass
+
+
+def per_call(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / n_calls
+
+
+base = per_call(bare)
+off = per_call(hooks) - base
+with profiling.profile() as profiler:
+    on = per_call(hooks) - base
+assert profiler.counters["bench.count"] == n_calls and not profiling.enabled
+print(f"timer + counter, off {off * 1e9:8.0f} ns/call")
+print(f"timer + counter, on  {on * 1e9:8.0f} ns/call")
+
+# End to end: a small reconstruction is the worst case for relative overhead
+angles = joint_angles()[None]
+n_runs = 2000
+
+
+def run():
+    for _ in range(n_runs):
+        reconstruct(angles)
+
+
+start = time.perf_counter()
+run()
+plain = (time.perf_counter() - start) / n_runs
+with profiling.profile() as profiler:
+    start = time.perf_counter()
+    run()
+    profiled = (time.perf_counter() - start) / n_runs
+print(f"reconstruct (1 cycle) off {plain * 1e6:8.1f} us  on {profiled * 1e6:8.1f} us")
+stats = profiler.summary()["stages"]["reconstruct.fit"]
+print(f"reconstruct.fit p50 {stats['p50'] * 1e6:.1f} us, p95 {stats['p95'] * 1e6:.1f} us over {stats['count']} calls")
@@ -0,0 +1,49 @@
+# Throughput of the batched spline engine vs. the per-joint path used in simul.py
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait.data import joint_angles
+from gait.reconstruction import reconstruct
+
+n_trials = 2000  # Number of recorded gait cycles to reconstruct
+n_interp = 500   # Evaluation grid used by simul.py
+
+# Jitter the sample cycle so every trial is a different signal
+rng = np.random.default_rng(0)
+angles = joint_angles()[None] + rng.normal(0, 0.5, (n_trials, 4, 51))
+t = np.linspace(0, 1, angles.shape[-1])
+t_interp = np.linspace(0, 1, n_interp)
+
+
+def script_path():
+    # One CubicSpline, deg2rad and np.gradient per joint per trial, as in simul.py
+    for trial in angles:
+        for joint in trial:
+            cs = CubicSpline(t, joint)
+            theta = np.deg2rad(cs(t_interp))
+            np.gradient(theta, t_interp)
+
+
+def batched_path():
+    reconstruct(angles, t=t, t_interp=t_interp)
+
+
+# Both paths must agree before timing them
+batched = reconstruct(angles[:3], t=t, t_interp=t_interp)
+for i in range(3):
+    for j in range(4):
+        cs = CubicSpline(t, angles[i, j])
+        assert np.allclose(batched.degrees[i, j], cs(t_interp))
+        assert np.allclose(batched.velocity[i, j], np.deg2rad(cs(t_interp, 1)))
+
+for name, fn in [("script (per joint)", script_path), ("batched", batched_path)]:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:20s} {elapsed:8.3f} s  {n_trials / elapsed:10.0f} cycles/s")
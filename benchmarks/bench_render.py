@@ -0,0 +1,28 @@
+# Frames per second of the parallel renderer as the number of workers grows
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait.data import joint_angles
+from gait.kinematics import forward_kinematics, leg_polylines
+from gait.reconstruction import reconstruct
+from gait.render import render_parallel
+from gait.scene import DoublePendulumScene
+
+n_frames = 1200  # A 40 s clip at 30 fps
+
+recon = reconstruct(joint_angles(), n_interp=n_frames)
+hip, knee = recon.radians[:2], recon.radians[2:]
+scene = DoublePendulumScene(*leg_polylines(forward_kinematics(hip, knee)))
+
+baseline = None
+with tempfile.TemporaryDirectory() as tmp:
+    for workers in sorted({1, 2, 4, os.cpu_count()}):
+        if workers > os.cpu_count():
+            continue
+        stats = render_parallel(scene, os.path.join(tmp, "bench.mp4"), workers=workers)
+        baseline = baseline or stats["fps"]
+        print(f"{workers:3d} workers  {stats['fps']:8.1f} fps  speedup {stats['fps'] / baseline:5.2f}x")
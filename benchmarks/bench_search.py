@@ -0,0 +1,68 @@
+# Query latency of the gait-cycle similarity index at 10^5-10^7 cycles
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait.data import joint_angles
+from gait.search import SimilarityIndex, cycle_features
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument("--sizes", type=int, nargs="+", default=[10 ** 5, 10 ** 6, 10 ** 7])
+parser.add_argument("--n-terms", type=int, default=3, help="harmonics per joint (3 -> 28 features)")
+parser.add_argument("--queries", type=int, default=50)
+parser.add_argument("-k", type=int, default=10)
+parser.add_argument("--n-probe", type=int, default=8)
+args = parser.parse_args()
+
+rng = np.random.default_rng(0)
+base = cycle_features(joint_angles(), args.n_terms).ravel()
+n_features = len(base)
+# Higher harmonics vary less between people; cycles cluster around their subject
+harmonics = np.arange(1, args.n_terms + 1)
+spread = np.tile(np.r_[5.0, 3.0 / harmonics, 3.0 / harmonics], 4).astype(np.float32)
+n_subjects = 10000
+subjects = base + rng.normal(0, 1, (n_subjects, n_features)).astype(np.float32) * spread
+
+
+def cohort(n, seed):
+    # n cycles of random subjects, generated in blocks to bound memory
+    gen = np.random.default_rng(seed)
+    for start in range(0, n, 10 ** 6):
+        m = min(10 ** 6, n - start)
+        yield (subjects[gen.integers(n_subjects, size=m)]
+               + gen.normal(0, 0.3, (m, n_features)).astype(np.float32) * spread)
+
+
+def latency(fn, n_queries):
+    fn(queries[:1])  # Warm up
+    start = time.perf_counter()
+    result = fn(queries)
+    return result, (time.perf_counter() - start) / n_queries
+
+
+queries = next(cohort(args.queries, seed=1))
+for n in args.sizes:
+    index = SimilarityIndex(args.n_terms)
+    index.reserve(n, n_features)  # One allocation for the whole cohort
+    build = 0.0
+    for block in cohort(n, seed=2):
+        start = time.perf_counter()
+        index.add_features(block)
+        build += time.perf_counter() - start
+    start = time.perf_counter()
+    index.train()
+    train = time.perf_counter() - start
+
+    exact, exact_latency = latency(lambda q: index.query_features(q, args.k), len(queries))
+    approx, approx_latency = latency(
+        lambda q: index.query_features(q, args.k, approximate=True, n_probe=args.n_probe), len(queries))
+    recall = np.mean([len(np.intersect1d(a, e)) / args.k for a, e in zip(approx.ids, exact.ids)])
+    print(f"{n:>9d} cycles  insert {n / build / 1e6:6.2f} M/s  train {train:6.1f} s  "
+          f"exact {exact_latency * 1e3:8.2f} ms/query  approx {approx_latency * 1e3:6.2f} ms/query  "
+          f"recall@{args.k} {recall:.3f}  ({index.features.nbytes / 2 ** 20:.0f} MiB)")
+    del index
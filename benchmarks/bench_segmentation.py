@@ -0,0 +1,41 @@
+# Block-size independence and throughput of streaming cycle segmentation
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait.data import joint_angles
+from gait.segmentation import find_cycle_starts
+
+n_cycles = 2000
+rng = np.random.default_rng(0)
+recording = np.tile(joint_angles()[:, :-1], n_cycles) + rng.normal(0, 0.5, (4, n_cycles * 50))
+
+
+def blocks(block_size, n=None, skip=0):
+    data = recording[:, skip:n]
+    yield data[:, :0]  # Empty blocks are allowed anywhere in the stream
+    for start in range(0, data.shape[1], block_size):
+        yield data[:, start:start + block_size]
+
+
+# The starts must not depend on how the stream is chunked, including a
+# recording that begins mid-stance where the running level is still settling
+for skip in (0, 25):
+    reference = find_cycle_starts(blocks(10 ** 9, 20 * 50, skip))
+    for block_size in (1000, 100, 37, 10, 3, 1):
+        chunked = find_cycle_starts(blocks(block_size, 20 * 50, skip))
+        assert np.array_equal(chunked, reference), (skip, block_size, len(chunked), len(reference))
+    lengths = np.diff(reference)
+    assert lengths.min() >= 45 and lengths.max() <= 55, (skip, reference[:4])
+    print(f"20 noisy cycles from sample {skip}: {len(reference)} starts for every block size, "
+          f"cycle lengths {lengths.min()}-{lengths.max()}")
+
+for block_size in (65536, 4096, 256):
+    start = time.perf_counter()
+    starts = find_cycle_starts(blocks(block_size))
+    elapsed = time.perf_counter() - start
+    print(f"block {block_size:6d}  {len(starts):5d} starts  {recording.shape[1] / elapsed / 1e6:6.2f} M samples/s")
@@ -0,0 +1,38 @@
+# Per-sample latency of the streaming reconstructor (p50/p99)
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait.data import joint_angles
+from gait.streaming import StreamingReconstructor
+
+n_samples = 50_000
+feed = np.tile(joint_angles()[:, :-1], (1, n_samples // 50))  # 4 joints, continuous cycles
+
+for sample_rate, window in [(100.0, 9), (1000.0, 31)]:
+    # One sample per call, as a sensor callback would deliver them
+    stream = StreamingReconstructor(sample_rate=sample_rate, window=window)
+    latencies = np.empty(n_samples)
+    for i, sample in enumerate(feed.T):
+        start = time.perf_counter_ns()
+        stream.push(sample)
+        latencies[i] = time.perf_counter_ns() - start
+    p50, p99 = np.percentile(latencies[window:], [50, 99]) / 1000
+    print(f"{sample_rate:6.0f} Hz window {window:3d}  push        p50 {p50:7.1f} us  p99 {p99:7.1f} us  "
+          f"budget {1e6 / sample_rate:7.0f} us")
+
+    # Small blocks, as a buffered driver would deliver them
+    for block_size in [10, 100]:
+        stream = StreamingReconstructor(sample_rate=sample_rate, window=window)
+        latencies = []
+        for start_idx in range(0, n_samples, block_size):
+            start = time.perf_counter_ns()
+            stream.push_block(feed[:, start_idx:start_idx + block_size])
+            latencies.append((time.perf_counter_ns() - start) / block_size)
+        p50, p99 = np.percentile(latencies[1:], [50, 99]) / 1000
+        print(f"{sample_rate:6.0f} Hz window {window:3d}  block {block_size:4d}  p50 {p50:7.1f} us  p99 {p99:7.1f} us  "
+              f"per sample")
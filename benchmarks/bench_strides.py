@@ -0,0 +1,54 @@
+# Scaling of the stride metrics extractor with the number of cycles
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait.data import joint_angles
+from gait.kinematics import forward_kinematics
+from gait.reconstruction import reconstruct
+from gait.strides import stride_metrics
+
+n_interp = 500  # Frames per cycle, as in simul.py
+batch = 1000    # Distinct jittered cycles, tiled up to each cohort size
+
+rng = np.random.default_rng(0)
+angles = joint_angles()[None] + rng.normal(0, 0.5, (batch, 4, 51))
+recon = reconstruct(angles, n_interp=n_interp)
+base = forward_kinematics(recon.radians[:, :2], recon.radians[:, 2:])
+
+# The extractor must match a plain per-cycle computation of the same definitions
+table = stride_metrics(base, closed=True)
+for row in range(0, 2 * batch, 397):
+    foot_x = base.foot_x.reshape(-1, n_interp)[row, :-1]
+    assert np.isclose(table["stride_length"][row], np.ptp(foot_x))
+    assert table["heel_strike"][row] == np.argmax(foot_x) and table["toe_off"][row] == np.argmin(foot_x)
+print(f"median stance fraction {np.median(table['stance_fraction']):.3f}, "
+      f"irregular strides {np.mean(table['crossings'] != 2):.1%}")
+
+previous = None
+for n_cycles in (1000, 4000, 16000, 64000):
+    reps = n_cycles // batch
+    positions = base._replace(foot_x=np.tile(base.foot_x, (reps, 1, 1)), foot_y=np.tile(base.foot_y, (reps, 1, 1)))
+    start = time.perf_counter()
+    stride_metrics(positions, duration=1.1, closed=True)
+    elapsed = time.perf_counter() - start
+    strides = 2 * n_cycles  # Both legs
+    scaling = "" if previous is None else f"  x{elapsed / previous:.1f} time for x4 cycles"
+    print(f"{n_cycles:8d} cycles {elapsed:8.3f} s  {elapsed / strides * 1e6:7.2f} us/stride{scaling}")
+    previous = elapsed
+
+# Working memory is bounded by the chunk budget; only the table grows with the cohort
+budget = 16 * 2 ** 20
+tracemalloc.start()
+table = stride_metrics(positions, duration=1.1, closed=True, memory_budget=budget)
+peak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+table_bytes = sum(column.nbytes for column in table.values())
+assert peak <= budget + table_bytes, (peak, budget, table_bytes)
+print(f"peak {peak / 2 ** 20:.1f} MiB for {n_cycles} cycles "
+      f"({budget / 2 ** 20:.0f} MiB budget + {table_bytes / 2 ** 20:.1f} MiB table)")
@@ -0,0 +1,81 @@
+# Parameter-sweep engine vs. one simul_leg_paper.py configuration at a time
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gait.kinematics import forward_kinematics
+from gait.strides import stride_metrics
+from gait.sweep import sinusoidal_gait, sweep
+
+n_frames = 500
+grid = dict(
+    duration=np.linspace(1.0, 2.5, 4),
+    hip_amplitude=np.linspace(5, 25, 9),
+    hip_offset=np.linspace(0, 20, 9),
+    knee_amplitude=np.linspace(10, 40, 9),
+    knee_offset=np.linspace(10, 40, 9),
+    L1=np.linspace(0.8, 1.2, 5),
+    L2=np.linspace(0.8, 1.2, 5),
+)
+n_configs = int(np.prod([len(values) for values in grid.values()]))
+
+
+def script_loop(n):
+    # The script's generator and kinematics for one configuration at a time
+    out = np.empty((n, 2))
+    for i, params in enumerate(zip(*(values.ravel() for values in np.meshgrid(*grid.values(), indexing="ij")))):
+        if i == n:
+            break
+        duration, ha, ho, ka, ko, l1, l2 = params
+        t_eval = np.linspace(0, duration, n_frames)
+        theta_dh, theta_dk = sinusoidal_gait(t_eval, duration, ha, ho, ka, ko)
+        positions = forward_kinematics(theta_dh, theta_dk, l1, l2, degrees=True)
+        table = stride_metrics(positions, duration, closed=True)
+        out[i] = table["stride_length"][0], table["foot_clearance"][0]
+    return out
+
+
+def owned_bytes(arrays):
+    # Memory held by the arrays themselves, counting shared bases once
+    bases = {}
+    for a in arrays:
+        while a.base is not None:
+            a = a.base
+        bases[id(a)] = a.nbytes
+    return sum(bases.values())
+
+
+# Both paths must agree before timing them
+n_loop = 2000
+result = sweep(n_frames=n_frames, **grid)
+loop = script_loop(n_loop)
+assert np.allclose(result.metrics["stride_length"].ravel()[:n_loop], loop[:, 0])
+assert np.allclose(result.metrics["foot_clearance"].ravel()[:n_loop], loop[:, 1])
+
+start = time.perf_counter()
+script_loop(n_loop)
+elapsed = time.perf_counter() - start
+print(f"{'per configuration':24s} {elapsed:8.3f} s  {n_loop / elapsed:12.0f} configs/s")
+
+for budget in (4 * 2 ** 20, 64 * 2 ** 20):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = sweep(n_frames=n_frames, memory_budget=budget, **grid)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # The budget covers the working arrays; the returned metrics come on top
+    working = peak - owned_bytes(result.metrics.values())
+    assert peak <= budget + owned_bytes(result.metrics.values()), (working, budget)
+    label = f"sweep ({budget / 2 ** 20:.0f} MiB budget)"
+    print(f"{label:24s} {elapsed:8.3f} s  {n_configs / elapsed:12.0f} configs/s  "
+          f"working {working / 2 ** 20:6.1f} MiB  peak {peak / 2 ** 20:6.1f} MiB")
+
+trajectories = n_configs / len(grid["duration"]) * n_frames * 4 * 8
+print(f"{n_configs} configurations; materializing the foot/knee trajectories would take "
+      f"{trajectories / 2 ** 20:.0f} MiB")
@@ -1,6 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from gait.fourier import fourier_coefficients, fourier_reconstruct
+
 # Data points
 data = [1.28, 1.41, 1.16, 0.41, -0.48, -0.99, -0.66, 0.31, 1.09, 1.09, 
         0.33, -0.74, -1.71, -2.48, -3.11, -3.7, -4.35, -4.98, -5.28, 
@@ -11,16 +13,11 @@ data = [1.28, 1.41, 1.16, 0.41, -0.48, -0.99, -0.66, 0.31, 1.09, 1.09,
 n = len(data)
 x = np.linspace(0, 2 * np.pi, n)
 
-# Compute DFT
-dft = np.fft.fft(data)
-a0 = dft[0].real / n  # DC component
-an = 2 * dft[1:n//2].real / n  # Cosine coefficients
-bn = -2 * dft[1:n//2].imag / n  # Sine coefficients
+# Compute Fourier series coefficients from the DFT
+a0, an, bn = fourier_coefficients(data)  # DC, cosine and sine coefficients
 
-# Reconstruct using Fourier series
-reconstructed = a0 + sum(
-    an[k] * np.cos((k + 1) * x) + bn[k] * np.sin((k + 1) * x) for k in range(len(an))
-)
+# Reconstruct using Fourier series on the same 0..2*pi grid
+reconstructed = fourier_reconstruct((a0, an, bn), n, endpoint=True)
 
 # Print Fourier coefficients
 results = {
@@ -0,0 +1,40 @@
+# Importable building blocks shared by the gait-cycle scripts
+#
+# Importing gait or any of its modules has no side effects and only loads
+# numpy: scipy and matplotlib are imported inside the functions that need
+# them, so short-lived numerical workers never pay for the plotting stack.
+# The main entry points are also available as attributes of the package;
+# each is imported from its module on first access.
+import importlib
+
+_EXPORTS = {
+    "joint_angles": "gait.data",
+    "reconstruct": "gait.reconstruction",
+    "forward_kinematics": "gait.kinematics",
+    "fourier_coefficients": "gait.fourier",
+    "fourier_reconstruct": "gait.fourier",
+    "fit_polynomials": "gait.polyfit",
+    "evaluate_polynomials": "gait.polyfit",
+    "fit_piecewise": "gait.piecewise",
+    "evaluate_piecewise": "gait.piecewise",
+    "pendulum_sweep": "gait.pendulum",
+    "PeriodicCycle": "gait.periodic",
+    "joint_torques": "gait.dynamics",
+    "stride_metrics": "gait.strides",
+    "SimilarityIndex": "gait.search",
+    "render_parallel": "gait.render",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'gait' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,78 @@
+# Compact on-disk archive of truncated Fourier coefficients for many cycles
+#
+# Layout (little endian):
+#   header  32 bytes: magic b"GAITFC01", n_cycles (uint64), n_joints (uint32),
+#                     n_terms (uint32), 8 reserved bytes
+#   body    float32 array (n_cycles x n_joints x (1 + 2 * n_terms)) holding
+#           [a0, an[0..n_terms), bn[0..n_terms)] for every cycle and joint
+import struct
+
+import numpy as np
+
+from gait.fourier import FourierCoefficients, fourier_coefficients, fourier_reconstruct
+
+MAGIC = b"GAITFC01"
+HEADER = struct.Struct("<8sQII8x")
+
+
+def _pack(coefficients):
+    a0, an, bn = coefficients
+    return np.concatenate([np.asarray(a0)[..., None], an, bn], axis=-1).astype("<f4")
+
+
+def _check_cycles(cycles):
+    cycles = np.asarray(cycles)
+    if cycles.ndim != 3:
+        raise ValueError(f"Expected (n_cycles x n_joints x n_samples) cycles, got shape {cycles.shape}")
+    return cycles
+
+
+def _read_header(f):
+    magic, n_cycles, n_joints, n_terms = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("Not a gait Fourier coefficient archive")
+    return n_cycles, n_joints, n_terms
+
+
+def write_archive(path, cycles, n_terms):
+    """Store (n_cycles x n_joints x n_samples) cycles as `n_terms` harmonics each."""
+    body = _pack(fourier_coefficients(_check_cycles(cycles), n_terms))
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, body.shape[0], body.shape[1], n_terms))
+        f.write(body.tobytes())
+
+
+def append_archive(path, cycles):
+    """Append more cycles to an existing archive, keeping its joints and n_terms."""
+    with open(path, "r+b") as f:
+        n_cycles, n_joints, n_terms = _read_header(f)
+        body = _pack(fourier_coefficients(_check_cycles(cycles), n_terms))
+        if body.shape[1] != n_joints:
+            raise ValueError(f"Archive holds {n_joints} joints, got {body.shape[1]}")
+        f.seek(0, 2)
+        f.write(body.tobytes())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, n_cycles + body.shape[0], n_joints, n_terms))
+
+
+class CoefficientArchive:
+    """Read-only, memory-mapped view of an archive file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.n_cycles, self.n_joints, self.n_terms = _read_header(f)
+        self.data = np.memmap(path, dtype="<f4", mode="r", offset=HEADER.size,
+                              shape=(self.n_cycles, self.n_joints, 1 + 2 * self.n_terms))
+
+    def __len__(self):
+        return self.n_cycles
+
+    def coefficients(self, cycles=slice(None)):
+        """FourierCoefficients of the selected cycles (only those pages are read)."""
+        block = np.asarray(self.data[cycles], dtype=float)
+        n = self.n_terms
+        return FourierCoefficients(block[..., 0], block[..., 1:n + 1], block[..., n + 1:])
+
+    def decode(self, cycles=slice(None), n_samples=101):
+        """Time-domain angles of the selected cycles at any resolution."""
+        return fourier_reconstruct(self.coefficients(cycles), n_samples)
@@ -0,0 +1,205 @@
+# Headless cohort runner with a content-addressed result cache
+#
+# Every (subject, method, parameters) result is stored under the SHA-256 of
+# the subject's data together with the method name and its parameters, so a
+# rerun only recomputes the entries whose inputs or parameters changed.
+# CACHE_VERSION is part of every key; bump it whenever a method's output or
+# the stored format changes so stale results are never read back.
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from gait.fourier import fourier_coefficients, fourier_reconstruct
+from gait.loaders import iter_blocks
+from gait.piecewise import evaluate_piecewise, fit_piecewise
+from gait.polyfit import evaluate_polynomials, fit_polynomials
+from gait.reconstruction import reconstruct
+
+CACHE_VERSION = 1
+
+
+def _spline(angles, n_interp=500):
+    recon = reconstruct(angles, n_interp=n_interp)
+    return {"t": recon.t, "degrees": recon.degrees, "velocity": recon.velocity}
+
+
+def _fourier(angles, n_terms=20, n_samples=500):
+    a0, an, bn = fourier_coefficients(angles, n_terms)
+    return {"a0": a0, "an": an, "bn": bn, "degrees": fourier_reconstruct((a0, an, bn), n_samples)}
+
+
+def _polynomial(angles, degree=12, basis="chebyshev", n_samples=500):
+    t = np.linspace(0, 1, angles.shape[-1])
+    fit = fit_polynomials(t, angles, degree, basis)
+    return {"coef": fit.coef, "degrees": evaluate_polynomials(fit, np.linspace(0, 1, n_samples))}
+
+
+def _piecewise(angles, breakpoints=(0, 0.2, 0.4, 0.6, 0.8, 1), degree=3, continuity=None, n_samples=500):
+    t = np.linspace(0, 1, angles.shape[-1])
+    fit = fit_piecewise(t, angles, breakpoints, degree, continuity)
+    return {"coef": fit.coef, "degrees": evaluate_piecewise(fit, np.linspace(0, 1, n_samples))}
+
+
+# Reconstruction methods by name; each takes (n_joints x n_samples) angles and keyword parameters
+METHODS = {
+    "spline": _spline,
+    "fourier": _fourier,
+    "polynomial": _polynomial,
+    "piecewise": _piecewise,
+}
+
+
+def resolve_params(method, params):
+    """`params` completed with the method's defaults, so omitted and explicit defaults share a key.
+
+    Raises ValueError for parameters the method does not take.
+    """
+    signature = inspect.signature(METHODS[method])
+    names = list(signature.parameters)[1:]
+    unknown = sorted(set(params) - set(names))
+    if unknown:
+        raise ValueError(f"{method}: unknown parameter(s) {', '.join(unknown)}; expected {', '.join(names)}")
+    bound = signature.bind_partial(None, **params)
+    bound.apply_defaults()
+    return {name: value for name, value in bound.arguments.items() if name != "angles"}
+
+
+def validate_params(method, params, n_samples):
+    """Raise ValueError if resolved `params` cannot be applied to `n_samples` samples per joint.
+
+    Checked before hashing, so a result is never cached under parameters it
+    was not actually computed with.
+    """
+    for name in ("n_interp", "n_samples"):
+        if name in params and params[name] < 2:
+            raise ValueError(f"{method}: {name} must be at least 2, got {params[name]}")
+    if method == "fourier" and not 0 <= params["n_terms"] <= n_samples // 2:
+        raise ValueError(f"fourier: n_terms must be between 0 and {n_samples // 2} "
+                         f"for {n_samples} samples, got {params['n_terms']}")
+    if method == "polynomial" and not 0 <= params["degree"] < n_samples:
+        raise ValueError(f"polynomial: degree must be between 0 and {n_samples - 1} "
+                         f"for {n_samples} samples, got {params['degree']}")
+    if method == "piecewise":
+        breakpoints = np.asarray(params["breakpoints"], dtype=float)
+        if breakpoints.ndim != 1 or len(breakpoints) < 2 or np.any(np.diff(breakpoints) <= 0):
+            raise ValueError(f"piecewise: breakpoints must be strictly increasing, got {params['breakpoints']}")
+
+
+def cache_key(angles, method, params):
+    """Content hash of the cache version, the input data, the method name and its parameters."""
+    angles = np.ascontiguousarray(angles, dtype=float)
+    digest = hashlib.sha256()
+    digest.update(f"gait-cohort-v{CACHE_VERSION}".encode())
+    digest.update(str(angles.shape).encode())
+    digest.update(angles.tobytes())
+    digest.update(json.dumps([method, params], sort_keys=True, default=list).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Directory of .npz results addressed by cache_key."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path(self, key):
+        return self.root / key[:2] / f"{key}.npz"
+
+    def __contains__(self, key):
+        return self.path(key).exists()
+
+    def load(self, key):
+        with np.load(self.path(key)) as data:
+            return dict(data)
+
+    def store(self, key, result):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial result
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **result)
+        os.replace(tmp, path)
+
+
+def load_subject(path):
+    """(n_joints x n_samples) angles from a .npy/.csv recording of one subject."""
+    return np.concatenate(list(iter_blocks(path)), axis=1)
+
+
+def _run_subject(angles, jobs, cache_root):
+    # Worker: compute every uncached (method, params, key) job for one subject
+    cache = ResultCache(cache_root)
+    for method, params, key in jobs:
+        cache.store(key, METHODS[method](angles, **params))
+    return len(jobs)
+
+
+def run_cohort(subjects, methods, cache_dir, workers=None, load=True):
+    """Run `methods` ({name: params}) on every subject ({subject_id: angles}).
+
+    Subjects with uncached results are sharded across a process pool; the
+    workers write into the cache and the parent reads everything back, or
+    with load=False only returns the cache file paths.
+    Returns ({subject_id: {method: result or path}}, {"hits": n, "misses": n}).
+    Invalid parameters raise ValueError before anything is computed.
+    """
+    cache = ResultCache(cache_dir)
+    keys = {}
+    pending = {}
+    methods = {method: resolve_params(method, params) for method, params in methods.items()}
+    for subject, angles in subjects.items():
+        for method, params in methods.items():
+            validate_params(method, params, np.shape(angles)[-1])
+            key = keys[subject, method] = cache_key(angles, method, params)
+            if key not in cache:
+                pending.setdefault(subject, []).append((method, params, key))
+
+    misses = sum(len(jobs) for jobs in pending.values())
+    if pending:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_run_subject, np.asarray(subjects[subject], dtype=float), jobs, str(cache.root))
+                       for subject, jobs in pending.items()]
+            for future in futures:
+                future.result()
+
+    fetch = cache.load if load else cache.path
+    results = {subject: {method: fetch(keys[subject, method]) for method in methods} for subject in subjects}
+    return results, {"hits": len(keys) - misses, "misses": misses}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruct every subject recording in a directory.")
+    parser.add_argument("cohort", help="directory with one .npy or .csv file per subject")
+    parser.add_argument("--methods", nargs="+", default=list(METHODS), choices=list(METHODS))
+    parser.add_argument("--params", default="{}",
+                        help='JSON parameters per method, e.g. \'{"fourier": {"n_terms": 10}}\'')
+    parser.add_argument("--cache", default=".gait-cache", help="result cache directory")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument("--paths", action="store_true", help="print the cached result file of every subject and method")
+    args = parser.parse_args()
+
+    params = json.loads(args.params)
+    paths = sorted(p for p in Path(args.cohort).iterdir() if p.suffix in (".npy", ".csv"))
+    subjects = {p.stem: load_subject(p) for p in paths}
+    try:
+        results, counts = run_cohort(subjects, {m: params.get(m, {}) for m in args.methods}, args.cache,
+                                     args.workers, load=False)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.paths:
+        for subject, files in results.items():
+            for method, path in files.items():
+                print(f"{subject}\t{method}\t{path}")
+    print(f"{len(subjects)} subjects, {counts['misses']} computed, {counts['hits']} from cache")
+
+
+if __name__ == "__main__":
+    main()
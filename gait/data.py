@@ -0,0 +1,54 @@
+# Sample gait-cycle recordings used by the scripts and benchmarks
+# (one cycle each, 51 samples normalized to 0-100% of the cycle)
+import numpy as np
+
+# Left hip flexion (degrees)
+left_hip_flexion = [
+    -16.56, -16.82, -16.53, -15.4, -13.44, -10.65, -7.15, -3.16, 0.95, 4.93,
+    8.63, 11.96, 14.96, 17.62, 19.89, 21.76, 23.24, 24.33, 24.98, 25.26,
+    25.25, 25.04, 24.8, 24.66, 24.66, 24.7, 24.61, 24.45, 24.13, 23.68,
+    22.96, 21.78, 20.24, 18.41, 16.38, 14.19, 11.91, 9.58, 7.22, 4.87,
+    2.57, 0.33, -1.85, -3.98, -6.06, -8.1, -10.06, -11.88, -13.5, -14.85, -15.88
+]
+
+# Right hip flexion (degrees)
+right_hip_flexion = [
+    24.61, 24.45, 24.13, 23.68, 22.96, 21.78, 20.24, 18.41, 16.38, 14.19,
+    11.91, 9.58, 7.22, 4.87, 2.57, 0.33, -1.85, -3.98, -6.06, -8.1, -10.06,
+    -11.88, -13.5, -14.85, -15.88, -16.56, -16.82, -16.53, -15.4, -13.44,
+    -10.65, -7.15, -3.16, 0.95, 4.93, 8.63, 11.96, 14.96, 17.62, 19.89,
+    21.76, 23.24, 24.33, 24.98, 25.26, 25.25, 25.04, 24.8, 24.66, 24.66, 24.7
+]
+
+# Left knee angle (degrees)
+left_knee_angle = [
+    -8.2, -11.29, -15.19, -20.17, -26.06, -32.67, -39.6, -46.16, -51.68, -55.66,
+    -57.83, -58.25, -57.28, -55.06, -51.58, -46.99, -41.48, -35.19, -28.31, -21.23,
+    -14.44, -8.48, -4.3, -2.27, -2.35, -4.14, -3.94, -6.66, -9.45, -12.26, -14.76,
+    -16.37, -17.04, -16.93, -16.24, -15.15, -13.87, -12.46, -10.95, -9.42, -7.96,
+    -6.59, -5.37, -4.29, -3.4, -2.72, -2.37, -2.44, -3, -4.08, -5.83
+]
+
+# Right knee angle (degrees)
+knee_right_angle = [
+    -3.94, -6.66, -9.45, -12.26, -14.76, -16.37, -17.04, -16.93, -16.24, -15.15,
+    -13.87, -12.46, -10.95, -9.42, -7.96, -6.59, -5.37, -4.29, -3.4, -2.72,
+    -2.37, -2.44, -3, -4.08, -5.83, -8.2, -11.29, -15.19, -20.17, -26.06,
+    -32.67, -39.6, -46.16, -51.68, -55.66, -57.83, -58.25, -57.28, -55.06, -51.58,
+    -46.99, -41.48, -35.19, -28.31, -21.23, -14.44, -8.48, -4.3, -2.27, -2.35, -4.14
+]
+
+# Left hip rotation used by the curve-fitting comparisons
+signal = [1.28, 1.41, 1.16, 0.41, -0.48, -0.99, -0.66, 0.31, 1.09, 1.09,
+          0.33, -0.74, -1.71, -2.48, -3.11, -3.7, -4.35, -4.98, -5.28, -4.96,
+          -4.03, -2.81, -1.85, -1.38, -1.27, -1.21, -1.35, -0.37, 1.36, 3.02,
+          3.99, 4.23, 4.18, 3.83, 3.23, 2.72, 2.4, 2.14, 1.83, 1.5, 1.21, 0.96,
+          0.71, 0.45, 0.2, -0.01, -0.09, -0.02, 0.21, 0.56, 0.95]
+
+# Joint order used for the stacked (n_trials x n_joints x n_samples) arrays
+JOINTS = ("left_hip", "right_hip", "left_knee", "right_knee")
+
+
+def joint_angles():
+    """Return the four sample joints stacked in JOINTS order (degrees)."""
+    return np.array([left_hip_flexion, right_hip_flexion, left_knee_angle, knee_right_angle])
@@ -0,0 +1,68 @@
+# Inverse dynamics of the double-pendulum leg model
+#
+# The thigh swings about a fixed hip and the shank about the knee, both with
+# absolute angles from the downward vertical (the convention of
+# gait.kinematics). The hip torque acts between pelvis and thigh, the knee
+# torque between thigh and shank.
+from collections import namedtuple
+
+import numpy as np
+
+# m: segment masses (kg), L: segment lengths (m), l: distance from the
+# proximal joint to the segment's centre of mass (m), I: moment of inertia
+# about the centre of mass (kg m^2); 1 is the thigh, 2 the shank (with foot)
+LegSegments = namedtuple("LegSegments", ["m1", "m2", "L1", "L2", "l1", "l2", "I1", "I2"])
+
+
+def anthropometric_segments(body_mass=70.0, height=1.75):
+    """Segment parameters from body mass and height using Winter's anthropometric tables."""
+    L1, L2 = 0.245 * height, 0.246 * height
+    m1, m2 = 0.100 * body_mass, 0.061 * body_mass
+    l1, l2 = 0.433 * L1, 0.606 * L2
+    I1, I2 = m1 * (0.323 * L1) ** 2, m2 * (0.416 * L2) ** 2
+    return LegSegments(m1, m2, L1, L2, l1, l2, I1, I2)
+
+
+def joint_torques(hip, knee, hip_velocity, knee_velocity, hip_acceleration, knee_acceleration,
+                  segments, g=9.81):
+    """Hip and knee torques (N m) from absolute segment angles and their derivatives.
+
+    Inputs are radians, rad/s and rad/s^2 with any matching shape, e.g.
+    (cycles x frames); segment parameters may be arrays that broadcast
+    against them. Everything is elementwise, so whole cohorts are one call.
+    """
+    m1, m2, L1, L2, l1, l2, I1, I2 = segments
+    delta = hip - knee
+    coupling = m2 * L1 * l2
+    cos_delta, sin_delta = np.cos(delta), np.sin(delta)
+
+    # Lagrange equations of the double pendulum in absolute angles
+    thigh = ((I1 + m1 * l1 ** 2 + m2 * L1 ** 2) * hip_acceleration
+             + coupling * (cos_delta * knee_acceleration + sin_delta * knee_velocity ** 2)
+             + (m1 * l1 + m2 * L1) * g * np.sin(hip))
+    shank = ((I2 + m2 * l2 ** 2) * knee_acceleration
+             + coupling * (cos_delta * hip_acceleration - sin_delta * hip_velocity ** 2)
+             + m2 * l2 * g * np.sin(knee))
+
+    # The thigh equation carries hip minus knee torque, the shank equation the knee torque
+    knee_torque = shank
+    hip_torque = thigh + knee_torque
+    return hip_torque, knee_torque
+
+
+def leg_torques(recon, segments, cycle_duration=1.0, g=9.81):
+    """Hip and knee torques for both legs of a `gait.reconstruction.Reconstruction`.
+
+    Joints must be in `gait.data.JOINTS` order on axis -2 (hips, then
+    knees). The reconstruction's time axis is in cycles, so derivatives
+    are rescaled by `cycle_duration` (seconds per cycle). Returns two
+    arrays shaped (..., 2 legs, n_frames).
+    """
+    theta = recon.radians
+    velocity = recon.velocity / cycle_duration
+    acceleration = recon.acceleration / cycle_duration ** 2
+    hips, knees = slice(0, 2), slice(2, 4)
+    return joint_torques(theta[..., hips, :], theta[..., knees, :],
+                         velocity[..., hips, :], velocity[..., knees, :],
+                         acceleration[..., hips, :], acceleration[..., knees, :],
+                         segments, g)
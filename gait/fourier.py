@@ -0,0 +1,61 @@
+# Fourier-series fits of gait cycles with cached basis matrices
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from gait import profiling
+
+# a0: (...), an/bn: (..., n_terms) cosine/sine coefficients of harmonics 1..n_terms
+FourierCoefficients = namedtuple("FourierCoefficients", ["a0", "an", "bn"])
+
+
+@profiling.timed("fourier.fit")
+def fourier_coefficients(signals, n_terms=None):
+    """a0/an/bn of one or many signals sampled over one period (last axis).
+
+    Defaults to every harmonic below Nyquist, as in fft.py; at most n // 2
+    harmonics exist, so asking for more raises ValueError.
+    """
+    signals = np.asarray(signals, dtype=float)
+    n = signals.shape[-1]
+    if n_terms is None:
+        n_terms = n // 2 - 1
+    if not 0 <= n_terms <= n // 2:
+        raise ValueError(f"n_terms must be between 0 and {n // 2} for {n} samples, got {n_terms}")
+    dft = np.fft.rfft(signals, axis=-1)
+    scale = np.full(n_terms, 2 / n)
+    if n % 2 == 0 and n_terms == n // 2:
+        scale[-1] = 1 / n  # The Nyquist bin has no conjugate partner
+    a0 = (dft[..., 0].real / n)[()]  # Plain scalar for a single signal
+    an = dft[..., 1:n_terms + 1].real * scale
+    bn = -dft[..., 1:n_terms + 1].imag * scale
+    return FourierCoefficients(a0, an, bn)
+
+
+@lru_cache(maxsize=32)
+def fourier_basis(n_samples, n_terms, endpoint=False):
+    """(2 * n_terms x n_samples) matrix of cos(k x) rows followed by sin(k x) rows.
+
+    `x` covers one period in `n_samples` steps; `endpoint=True` includes
+    2*pi like the `np.linspace(0, 2 * np.pi, n)` grid of fft.py. The
+    result is cached and read-only, so thousands of cycles at the same
+    resolution share one basis.
+    """
+    x = np.linspace(0, 2 * np.pi, n_samples, endpoint=endpoint)
+    kx = np.arange(1, n_terms + 1)[:, None] * x
+    basis = np.concatenate([np.cos(kx), np.sin(kx)])
+    basis.flags.writeable = False
+    return basis
+
+
+def fourier_reconstruct(coefficients, n_samples, endpoint=False):
+    """Evaluate Fourier series at `n_samples` points per period with one matrix multiply."""
+    a0, an, bn = coefficients
+    basis = fourier_basis(n_samples, np.shape(an)[-1], endpoint)
+    return np.asarray(a0)[..., None] + np.concatenate([an, bn], axis=-1) @ basis
+
+
+def harmonic_frequencies(n_samples, n_terms, sample_rate):
+    """Frequencies (Hz) of harmonics 1..n_terms for a cycle of `n_samples` at `sample_rate`."""
+    return np.arange(1, n_terms + 1) * sample_rate / n_samples
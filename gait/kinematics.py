@@ -0,0 +1,59 @@
+# Forward kinematics of the double-pendulum leg model
+from collections import namedtuple
+
+import numpy as np
+
+from gait import profiling
+
+# Knee (end of the thigh) and foot (end of the shin) coordinates, hip at the origin
+LegPositions = namedtuple("LegPositions", ["knee_x", "knee_y", "foot_x", "foot_y"])
+
+
+@profiling.timed("kinematics")
+def forward_kinematics(hip, knee, L1=1.0, L2=1.0, degrees=False, dtype=None, broadcast=False):
+    """Knee and foot positions for every frame of every leg.
+
+    `hip` and `knee` are absolute segment angles from the vertical with
+    matching shapes, e.g. (n_legs x n_frames). `L1`/`L2` are the thigh and
+    shin lengths; passing 1-D arrays evaluates every segment-length
+    configuration at once and adds a leading (n_configs) axis. With
+    `broadcast` the lengths broadcast against the angles elementwise
+    instead, e.g. (n_configs x 1) columns with (n_configs x n_frames) angles.
+
+    Positions are computed in `dtype`, by default float32 when both angle
+    arrays are float32 and float64 otherwise.
+    """
+    if dtype is None:
+        dtype = np.result_type(np.asarray(hip).dtype, np.asarray(knee).dtype, np.float32)
+    hip = np.asarray(hip, dtype=dtype)
+    knee = np.asarray(knee, dtype=dtype)
+    if degrees:
+        hip = np.deg2rad(hip)
+        knee = np.deg2rad(knee)
+
+    L1 = np.asarray(L1, dtype=dtype)
+    L2 = np.asarray(L2, dtype=dtype)
+    if (L1.ndim or L2.ndim) and not broadcast:
+        L1, L2 = np.broadcast_arrays(L1, L2)
+        L1 = L1.reshape(L1.shape + (1,) * hip.ndim)
+        L2 = L2.reshape(L2.shape + (1,) * hip.ndim)
+
+    # The trig is done once for the whole trajectory, not per frame
+    knee_x = L1 * np.sin(hip)
+    knee_y = -L1 * np.cos(hip)
+    foot_x = knee_x + L2 * np.sin(knee)
+    foot_y = knee_y - L2 * np.cos(knee)
+    return LegPositions(knee_x, knee_y, foot_x, foot_y)
+
+
+def leg_polylines(positions):
+    """Stack hip, knee and foot points into contiguous (..., n_frames, 3) x/y arrays.
+
+    Row `[..., frame, :]` is ready to pass to `Line2D.set_data`, so the
+    animation callbacks only have to index: `[:2]` is the thigh, `[1:]` the
+    shin and `[1:2]`/`[2:]` the knee/foot markers.
+    """
+    origin = np.zeros_like(positions.knee_x)
+    x = np.stack([origin, positions.knee_x, positions.foot_x], axis=-1)
+    y = np.stack([origin, positions.knee_y, positions.foot_y], axis=-1)
+    return np.ascontiguousarray(x), np.ascontiguousarray(y)
@@ -0,0 +1,111 @@
+# Streaming readers for long multi-joint recordings (.npy / .csv)
+#
+# Recordings are laid out with one row per sample and one column per joint.
+# The block iterators yield (n_joints x n) arrays, so memory stays bounded by
+# the block size no matter how long the file is.
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+from gait import profiling
+
+
+def read_header(path, delimiter=","):
+    """Column names from the first line of a CSV file, or None if it holds data."""
+    with open(path) as f:
+        first = f.readline().strip().split(delimiter)
+    try:
+        [float(value) for value in first]
+    except ValueError:
+        return [name.strip() for name in first]
+    return None
+
+
+def _column_indices(columns, header):
+    if columns is None:
+        return None
+    indices = []
+    for column in columns:
+        if isinstance(column, str):
+            if header is None or column not in header:
+                raise KeyError(f"Unknown joint column: {column!r}")
+            column = header.index(column)
+        indices.append(column)
+    return indices
+
+
+def iter_csv_blocks(path, block_size=65536, columns=None, delimiter=","):
+    """Yield (n_joints x block_size) arrays read from a CSV file in fixed-size chunks.
+
+    `columns` selects joints by header name or position.
+    """
+    header = read_header(path, delimiter)
+    indices = _column_indices(columns, header)
+    with open(path) as f:
+        if header is not None:
+            next(f)
+        while True:
+            lines = list(islice(f, block_size))
+            if not lines:
+                break
+            with profiling.timer("load.parse"):
+                block = np.loadtxt(lines, delimiter=delimiter, ndmin=2, usecols=indices)
+            profiling.count("load.samples", len(block))
+            yield block.T
+
+
+def iter_npy_blocks(path, block_size=65536, columns=None):
+    """Yield (n_joints x block_size) arrays from a memory-mapped .npy file.
+
+    Only the rows of the current block are paged in and copied.
+    """
+    data = np.load(path, mmap_mode="r")
+    if data.ndim == 1:
+        data = data[:, None]
+    indices = _column_indices(columns, None)
+    for start in range(0, data.shape[0], block_size):
+        block = data[start:start + block_size]
+        if indices is not None:
+            block = block[:, indices]
+        with profiling.timer("load.copy"):
+            block = np.array(block.T, dtype=float)
+        profiling.count("load.samples", block.shape[1])
+        yield block
+
+
+def iter_blocks(path, block_size=65536, columns=None):
+    """Dispatch to the .npy or CSV reader based on the file suffix."""
+    if Path(path).suffix == ".npy":
+        return iter_npy_blocks(path, block_size, columns)
+    return iter_csv_blocks(path, block_size, columns)
+
+
+def iter_joint(path, joint, block_size=65536):
+    """Yield consecutive 1-D chunks of a single joint."""
+    for block in iter_blocks(path, block_size, columns=[joint]):
+        yield block[0]
+
+
+def iter_windows(blocks, window, batch=1):
+    """Regroup a block stream into (batch x n_joints x window) arrays.
+
+    Samples that straddle block boundaries are carried over, so the windows
+    are contiguous in the recording. A trailing partial window is dropped.
+    The output has the (n_trials x n_joints x n_samples) layout accepted by
+    `gait.reconstruction.reconstruct`.
+    """
+    carry = None
+    windows = []
+    for block in blocks:
+        if carry is not None and carry.shape[1]:
+            block = np.concatenate([carry, block], axis=1)
+        n_full = block.shape[1] // window
+        for k in range(n_full):
+            windows.append(block[:, k * window:(k + 1) * window])
+            if len(windows) == batch:
+                yield np.stack(windows)
+                windows = []
+        carry = block[:, n_full * window:]
+    if windows:
+        yield np.stack(windows)
@@ -0,0 +1,125 @@
+# Ensemble integration of the nonlinear pendulum for initial-condition sweeps
+#
+# States are (n_conditions x 2) arrays of [theta, omega]; every integrator
+# advances the whole ensemble with array operations, and returns solutions
+# shaped (n_conditions x 2 x n_times) so that y[i] matches solve_ivp's sol.y.
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def pendulum_rhs(t, y, g=9.81, L=1.0):
+    """d[theta, omega]/dt for every condition; `g` and `L` may be per-condition arrays."""
+    dy = np.empty_like(y)
+    dy[:, 0] = y[:, 1]
+    dy[:, 1] = -(np.asarray(g) / np.asarray(L)) * np.sin(y[:, 0])
+    return dy
+
+
+def integrate_rk4(rhs, y0, t_eval, args=(), substeps=4):
+    """Classic fixed-step RK4 with `substeps` steps between consecutive `t_eval` points."""
+    y = np.array(y0, dtype=float)
+    out = [y.copy()]
+    for t0, t1 in zip(t_eval[:-1], t_eval[1:]):
+        h = (t1 - t0) / substeps
+        t = t0
+        for _ in range(substeps):
+            k1 = rhs(t, y, *args)
+            k2 = rhs(t + h / 2, y + h / 2 * k1, *args)
+            k3 = rhs(t + h / 2, y + h / 2 * k2, *args)
+            k4 = rhs(t + h, y + h * k3, *args)
+            y = y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            t += h
+        out.append(y.copy())
+    return np.stack(out, axis=-1)
+
+
+# Dormand-Prince 5(4) tableau, the same pair solve_ivp's RK45 uses
+_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1])
+_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]
+_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+_E = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+
+
+def integrate_rk45(rhs, y0, t_eval, args=(), rtol=1e-3, atol=1e-6):
+    """Adaptive Dormand-Prince integration of the whole ensemble.
+
+    The ensemble shares one step size, controlled by the worst member's
+    error estimate, and `t_eval` points are filled in by cubic Hermite
+    interpolation of each accepted step. Defaults match solve_ivp.
+    """
+    t_eval = np.asarray(t_eval, dtype=float)
+    t, t_end = t_eval[0], t_eval[-1]
+    y = np.array(y0, dtype=float)
+    f = rhs(t, y, *args)
+
+    # Initial step from the scale of the state and its derivative
+    scale = atol + np.abs(y) * rtol
+    d0 = np.sqrt(np.mean((y / scale) ** 2))
+    d1 = np.sqrt(np.mean((f / scale) ** 2))
+    h = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    h = min(h, t_end - t)
+
+    out = np.empty(y.shape + (len(t_eval),))
+    out[..., 0] = y
+    next_out = 1
+    while next_out < len(t_eval):
+        h = min(h, t_end - t)
+        k = [f]
+        for c, a in zip(_C[1:], _A[1:]):
+            k.append(rhs(t + c * h, y + h * sum(a_j * k_j for a_j, k_j in zip(a, k)), *args))
+        y_new = y + h * sum(b * k_j for b, k_j in zip(_B, k))
+        f_new = rhs(t + h, y_new, *args)
+        k.append(f_new)
+
+        error = h * sum(e * k_j for e, k_j in zip(_E, k))
+        scale = atol + np.maximum(np.abs(y), np.abs(y_new)) * rtol
+        norm = np.sqrt(np.mean((error / scale) ** 2, axis=-1)).max()
+
+        if norm <= 1:
+            # Fill every requested time inside the accepted step
+            t_new = t + h
+            stop = np.searchsorted(t_eval, t_new, side="right")
+            if stop > next_out:
+                s = ((t_eval[next_out:stop] - t) / h)[None, None, :]
+                h00, h10 = 2 * s ** 3 - 3 * s ** 2 + 1, s ** 3 - 2 * s ** 2 + s
+                h01, h11 = -2 * s ** 3 + 3 * s ** 2, s ** 3 - s ** 2
+                out[..., next_out:stop] = (h00 * y[..., None] + h10 * h * f[..., None]
+                                           + h01 * y_new[..., None] + h11 * h * f_new[..., None])
+                next_out = stop
+            t, y, f = t_new, y_new, f_new
+        factor = 10 if norm == 0 else min(10, max(0.2, 0.9 * norm ** -0.2))
+        h *= factor if norm <= 1 else min(1, factor)
+    return out
+
+
+def _integrate_chunk(y0, g, L, t_eval, method, kwargs):
+    integrate = integrate_rk45 if method == "rk45" else integrate_rk4
+    return integrate(pendulum_rhs, y0, t_eval, args=(g, L), **kwargs)
+
+
+def pendulum_sweep(y0, t_eval, g=9.81, L=1.0, method="rk45", workers=None, chunk_size=None, **kwargs):
+    """Integrate every initial condition (and per-condition g, L) in one ensemble.
+
+    With `workers` the conditions are split into chunks integrated in a
+    process pool, each chunk still vectorized.
+    """
+    y0 = np.asarray(y0, dtype=float)
+    g = np.broadcast_to(np.asarray(g, dtype=float), y0.shape[:1])
+    L = np.broadcast_to(np.asarray(L, dtype=float), y0.shape[:1])
+    if not workers:
+        return _integrate_chunk(y0, g, L, t_eval, method, kwargs)
+
+    chunk_size = chunk_size or -(-len(y0) // workers)
+    bounds = range(0, len(y0), chunk_size)
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_integrate_chunk, y0[i:i + chunk_size], g[i:i + chunk_size],
+                               L[i:i + chunk_size], t_eval, method, kwargs) for i in bounds]
+        return np.concatenate([future.result() for future in futures])
@@ -0,0 +1,97 @@
+# Periodic reconstruction of one gait cycle, repeated without refitting
+#
+# A cycle is fitted once with a periodic boundary (CubicSpline with
+# bc_type="periodic", or a truncated Fourier series) and evaluated once on a
+# grid covering [0, 1) of the cycle. N-cycle trajectories are then zero-copy
+# broadcast views, per-frame lookups or lazily generated blocks.
+import numpy as np
+
+from gait import profiling
+from gait.fourier import fourier_coefficients, fourier_reconstruct
+
+
+def close_cycle(angles):
+    """Copy of `angles` (samples over 0-100% on the last axis) whose two ends meet.
+
+    Both end samples are replaced by their mean, so the small mismatch of a
+    recorded cycle is split between them rather than patched with a fake
+    trailing sample.
+    """
+    closed = np.array(angles, dtype=float)
+    ends = (closed[..., 0] + closed[..., -1]) / 2
+    closed[..., 0] = ends
+    closed[..., -1] = ends
+    return closed
+
+
+class PeriodicCycle:
+    """One cycle of (joints x samples) angles, fitted once and repeatable indefinitely.
+
+    `n_samples` is the resolution per cycle; `method` is "spline" or
+    "fourier" (with `n_terms` harmonics, all of them by default). The
+    evaluated cycle, and every trajectory built from it, is stored as
+    `dtype`.
+    """
+
+    def __init__(self, angles, n_samples=1000, method="spline", n_terms=None, dtype=np.float64):
+        closed = close_cycle(angles)
+        self.n_samples = n_samples
+        self.method = method
+        self.t = np.linspace(0, 1, n_samples, endpoint=False)
+        with profiling.timer("periodic.fit"):
+            cycle = self._fit(closed, n_terms).astype(dtype, copy=False)
+        cycle.flags.writeable = False
+        self.cycle = cycle
+
+    def _fit(self, closed, n_terms):
+        # Fits the model and returns the cycle evaluated on self.t
+        method, n_samples = self.method, self.n_samples
+        if method == "spline":
+            from scipy.interpolate import CubicSpline
+
+            knots = np.linspace(0, 1, closed.shape[-1])
+            self._model = CubicSpline(knots, closed, bc_type="periodic", axis=-1)
+            cycle = self._model(self.t)
+        elif method == "fourier":
+            # The closing sample repeats the first one, so it is left out of the DFT
+            self._model = fourier_coefficients(closed[..., :-1], n_terms)
+            cycle = fourier_reconstruct(self._model, n_samples)
+        else:
+            raise ValueError(f"Unknown periodic method: {method!r}")
+        return cycle
+
+    def __call__(self, t):
+        """Angles at arbitrary times `t`, measured in cycles (1.0 is one full cycle)."""
+        phase = np.mod(t, 1.0)
+        if self.method == "spline":
+            return self._model(phase)
+        a0, an, bn = self._model
+        kx = 2 * np.pi * np.arange(1, an.shape[-1] + 1)[:, None] * np.ravel(phase)
+        values = np.asarray(a0)[..., None] + an @ np.cos(kx) + bn @ np.sin(kx)
+        return values.reshape(values.shape[:-1] + np.shape(phase))
+
+    def frame(self, i):
+        """Angles of global frame `i` of an arbitrarily long trajectory, in O(1)."""
+        return self.cycle[..., i % self.n_samples]
+
+    def trajectory(self, n_cycles):
+        """(n_cycles x joints x n_samples) read-only view of n repeated cycles, no copies."""
+        return np.broadcast_to(self.cycle, (n_cycles,) + self.cycle.shape)
+
+    def times(self, n_cycles):
+        """Time of every frame of an n-cycle trajectory, in cycles."""
+        return np.arange(n_cycles * self.n_samples) / self.n_samples
+
+    def series(self, n_cycles):
+        """Materialized (joints x n_cycles * n_samples) array, e.g. for plotting."""
+        return np.tile(self.cycle, n_cycles)
+
+    def iter_blocks(self, block_size=None, n_cycles=None):
+        """Lazily yield consecutive (joints x block_size) blocks; endless if n_cycles is None."""
+        block_size = block_size or self.n_samples
+        total = None if n_cycles is None else n_cycles * self.n_samples
+        start = 0
+        while total is None or start < total:
+            stop = start + block_size if total is None else min(start + block_size, total)
+            yield self.cycle[..., np.arange(start, stop) % self.n_samples]
+            start = stop
@@ -0,0 +1,100 @@
+# Batched piecewise-polynomial least squares over arbitrary breakpoints
+from collections import namedtuple
+from functools import lru_cache
+from math import factorial
+
+import numpy as np
+
+from gait import profiling
+
+# coef: (..., n_segments, degree + 1) power-series coefficients in the local
+# variable x = (t - breakpoints[s]) / (breakpoints[s + 1] - breakpoints[s])
+PiecewiseFit = namedtuple("PiecewiseFit", ["coef", "breakpoints"])
+
+
+@lru_cache(maxsize=64)
+def _segment_basis(t_bytes, breakpoints, degree):
+    # Segment of every sample and its local power basis (n_samples x degree + 1)
+    t = np.frombuffer(t_bytes)
+    edges = np.asarray(breakpoints)
+    segment = np.clip(np.searchsorted(edges, t, side="right") - 1, 0, len(edges) - 2)
+    x = (t - edges[segment]) / np.diff(edges)[segment]
+    basis = x[:, None] ** np.arange(degree + 1)
+    segment.flags.writeable = False
+    basis.flags.writeable = False
+    return segment, basis
+
+
+def _lookup(t, breakpoints, degree):
+    t = np.ascontiguousarray(t, dtype=float)
+    return _segment_basis(t.tobytes(), tuple(float(b) for b in breakpoints), degree)
+
+
+def _continuity_rows(breakpoints, degree, continuity):
+    # One row per interior breakpoint and derivative order m <= continuity:
+    # d^m/dt^m of segment s at x = 1 equals that of segment s + 1 at x = 0
+    widths = np.diff(breakpoints)
+    n_coef = degree + 1
+    rows = []
+    for s in range(len(widths) - 1):
+        for m in range(continuity + 1):
+            row = np.zeros((len(widths)) * n_coef)
+            for j in range(m, n_coef):
+                row[s * n_coef + j] = factorial(j) / factorial(j - m) / widths[s] ** m
+            row[(s + 1) * n_coef + m] -= factorial(m) / widths[s + 1] ** m
+            rows.append(row)
+    return np.array(rows).reshape(-1, len(widths) * n_coef)
+
+
+@lru_cache(maxsize=64)
+def _solver(t_bytes, breakpoints, degree, continuity):
+    # Linear map from samples to all segment coefficients (n_coef_total x n_samples)
+    segment, basis = _segment_basis(t_bytes, breakpoints, degree)
+    n_coef = degree + 1
+    n_total = (len(breakpoints) - 1) * n_coef
+
+    # Block-diagonal design matrix: sample i only touches its own segment's columns
+    design = np.zeros((len(segment), n_total))
+    columns = segment[:, None] * n_coef + np.arange(n_coef)
+    np.put_along_axis(design, columns, basis, axis=1)
+
+    if continuity is None:
+        solver = np.linalg.pinv(design)
+    else:
+        # Equality-constrained least squares through the KKT system
+        constraints = _continuity_rows(np.asarray(breakpoints), degree, continuity)
+        n_con = len(constraints)
+        kkt = np.block([[design.T @ design, constraints.T],
+                        [constraints, np.zeros((n_con, n_con))]])
+        solver = np.linalg.pinv(kkt)[:n_total, :n_total] @ design.T
+    solver.flags.writeable = False
+    return solver
+
+
+@profiling.timed("piecewise.fit")
+def fit_piecewise(t, signals, breakpoints, degree=3, continuity=None):
+    """Fit a degree-`degree` polynomial per segment to every signal at once.
+
+    `signals` share the grid `t` on their last axis; samples from
+    breakpoints[s] up to (not including) breakpoints[s + 1] belong to
+    segment s, the last segment also keeps the final breakpoint.
+    `continuity=k` makes the fit C^k at the interior breakpoints. The
+    solve operator is cached per (t, breakpoints, degree, continuity), so
+    a batch costs one matrix product.
+    """
+    if continuity is not None and continuity >= degree:
+        raise ValueError("continuity must be lower than the polynomial degree")
+    signals = np.asarray(signals, dtype=float)
+    t = np.ascontiguousarray(t, dtype=float)
+    breakpoints = tuple(float(b) for b in breakpoints)
+    solver = _solver(t.tobytes(), breakpoints, degree, continuity)
+    coef = signals @ solver.T
+    return PiecewiseFit(coef.reshape(signals.shape[:-1] + (len(breakpoints) - 1, degree + 1)),
+                        np.asarray(breakpoints))
+
+
+def evaluate_piecewise(fit, t):
+    """Evaluate every fitted piecewise polynomial at `t` (segment lookup cached per grid)."""
+    degree = fit.coef.shape[-1] - 1
+    segment, basis = _lookup(t, fit.breakpoints, degree)
+    return np.einsum("...ij,ij->...i", fit.coef[..., segment, :], basis)
@@ -0,0 +1,222 @@
+# Asyncio sensor -> reconstruction -> kinematics -> render pipeline
+#
+# Stages are connected by bounded queues. The reconstruction and kinematics
+# queues apply backpressure (reconstruction needs every sample), while the
+# render queue drops its oldest frame when full and the renderer coalesces
+# whatever is waiting into the latest frame, so a slow display never makes
+# memory grow.
+import argparse
+import asyncio
+import inspect
+import json
+import time
+
+import numpy as np
+
+from gait.data import joint_angles
+from gait.kinematics import forward_kinematics, leg_polylines
+from gait.loaders import iter_blocks
+from gait.streaming import StreamingReconstructor
+
+_DONE = object()
+
+
+class StageStats:
+    """Counters for one stage; `depth` tracks the stage's input queue."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.max_depth = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def as_dict(self, elapsed):
+        return {
+            "items": self.items,
+            "per_second": self.items / elapsed if elapsed else 0.0,
+            "busy_seconds": self.busy,
+            "max_queue_depth": self.max_depth,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+
+async def simulated_sensor(sample_rate=100.0, block_size=10, seconds=10.0, noise=0.5, realtime=True):
+    """Replay the sample gait cycle as a live 4-joint sensor, one block at a time."""
+    cycle = joint_angles()[:, :-1]
+    rng = np.random.default_rng()
+    n_blocks = int(seconds * sample_rate) // block_size
+    for k in range(n_blocks):
+        index = (np.arange(k * block_size, (k + 1) * block_size)) % cycle.shape[1]
+        yield cycle[:, index] + rng.normal(0, noise, (cycle.shape[0], block_size))
+        if realtime:
+            await asyncio.sleep(block_size / sample_rate)
+
+
+async def file_replay(path, sample_rate=100.0, block_size=10, realtime=True):
+    """Replay a .npy/.csv recording at `sample_rate` (or as fast as possible)."""
+    for block in iter_blocks(path, block_size):
+        yield block
+        if realtime:
+            await asyncio.sleep(block.shape[1] / sample_rate)
+
+
+def _track(queue, stats):
+    # Called before each dequeue, so the item about to be taken is counted
+    stats.max_depth = max(stats.max_depth, queue.qsize())
+
+
+def _offer_latest(queue, item, stats):
+    # Non-blocking put that evicts the oldest waiting frame when full
+    if queue.full():
+        queue.get_nowait()
+        stats.dropped += 1
+    queue.put_nowait(item)
+
+
+async def _source_stage(source, out, stats):
+    async for block in source:
+        stats.items += 1
+        await out.put(block)
+    await out.put(_DONE)
+
+
+async def _reconstruct_stage(inp, out, reconstructor, stats):
+    while True:
+        _track(inp, stats)
+        if (block := await inp.get()) is _DONE:
+            break
+        start = time.perf_counter()
+        frame = reconstructor.push_block(block)
+        stats.busy += time.perf_counter() - start
+        if frame is not None:
+            stats.items += 1
+            await out.put(frame)
+    await out.put(_DONE)
+
+
+async def _kinematics_stage(inp, out, L1, L2, stats, render_stats):
+    while True:
+        _track(inp, stats)
+        if (frame := await inp.get()) is _DONE:
+            break
+        start = time.perf_counter()
+        radians = np.deg2rad(frame.angles)
+        polylines = leg_polylines(forward_kinematics(radians[:2], radians[2:4], L1, L2))
+        stats.busy += time.perf_counter() - start
+        stats.items += 1
+        _offer_latest(out, polylines, render_stats)
+    # The end marker must not be dropped, so wait for room
+    await out.put(_DONE)
+
+
+async def _render_stage(inp, sink, stats):
+    done = False
+    while not done:
+        _track(inp, stats)
+        item = await inp.get()
+        if item is _DONE:
+            break
+        # Coalesce everything already waiting into the newest frame; the end
+        # marker stops the scan but the frame held so far is still drawn
+        while not inp.empty():
+            newer = inp.get_nowait()
+            if newer is _DONE:
+                done = True
+                break
+            item = newer
+            stats.coalesced += 1
+        start = time.perf_counter()
+        if sink is not None:
+            leg_x, leg_y = item
+            result = sink(leg_x[:, -1], leg_y[:, -1])
+            if inspect.isawaitable(result):
+                await result
+        stats.busy += time.perf_counter() - start
+        stats.items += 1
+
+
+def axes_sink(ax):
+    """Sink drawing both legs on a matplotlib Axes (left in blue, right in red)."""
+    left, = ax.plot([], [], 'bo-', lw=2)
+    right, = ax.plot([], [], 'ro-', lw=2)
+    canvas = ax.figure.canvas
+
+    def sink(leg_x, leg_y):
+        left.set_data(leg_x[0], leg_y[0])
+        right.set_data(leg_x[1], leg_y[1])
+        canvas.draw_idle()
+        canvas.flush_events()
+
+    return sink
+
+
+async def run_pipeline(source, sink=None, sample_rate=100.0, window=9, L1=1.0, L2=1.0, queue_size=8):
+    """Run the pipeline until `source` is exhausted and return per-stage statistics.
+
+    `source` is an async iterator of (4 x n) joint-angle blocks in degrees
+    (`simulated_sensor` or `file_replay`). `sink(leg_x, leg_y)` receives the
+    latest (2 x 3) hip/knee/foot polylines of the left and right leg; it
+    may be a coroutine function. Without a sink the pipeline runs headless.
+    """
+    stats = {name: StageStats(name) for name in ["source", "reconstruction", "kinematics", "render"]}
+    to_reconstruct = asyncio.Queue(queue_size)
+    to_kinematics = asyncio.Queue(queue_size)
+    to_render = asyncio.Queue(queue_size)
+    reconstructor = StreamingReconstructor(sample_rate=sample_rate, window=window, with_positions=False)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        _source_stage(source, to_reconstruct, stats["source"]),
+        _reconstruct_stage(to_reconstruct, to_kinematics, reconstructor, stats["reconstruction"]),
+        _kinematics_stage(to_kinematics, to_render, L1, L2, stats["kinematics"], stats["render"]),
+        _render_stage(to_render, sink, stats["render"]),
+    )
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "stages": {name: s.as_dict(elapsed) for name, s in stats.items()}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the gait pipeline headless and report stage statistics.")
+    parser.add_argument("--file", help="replay a .npy/.csv recording instead of the simulated sensor")
+    parser.add_argument("--rate", type=float, default=100.0, help="samples per second")
+    parser.add_argument("--block", type=int, default=10, help="samples per sensor block")
+    parser.add_argument("--seconds", type=float, default=5.0, help="length of the simulated feed")
+    parser.add_argument("--fast", action="store_true", help="do not pace the source in real time")
+    parser.add_argument("--render-delay", type=float, default=0.0,
+                        help="seconds a simulated renderer spends per frame")
+    parser.add_argument("--show", action="store_true", help="draw the legs in a window while running")
+    parser.add_argument("--stats", help="write the statistics to this JSON file")
+    args = parser.parse_args()
+
+    if args.file:
+        source = file_replay(args.file, args.rate, args.block, not args.fast)
+    else:
+        source = simulated_sensor(args.rate, args.block, args.seconds, realtime=not args.fast)
+
+    sink = None
+    if args.show:
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots()
+        ax.set_xlim(-2.5, 2.5)
+        ax.set_ylim(-2.5, 1)
+        ax.set_aspect('equal')
+        plt.show(block=False)
+        sink = axes_sink(ax)
+    elif args.render_delay:
+        async def sink(leg_x, leg_y):
+            await asyncio.sleep(args.render_delay)
+
+    result = asyncio.run(run_pipeline(source, sink, sample_rate=args.rate))
+    text = json.dumps(result, indent=2)
+    if args.stats:
+        with open(args.stats, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
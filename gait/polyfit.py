@@ -0,0 +1,88 @@
+# Well-conditioned polynomial least squares in a scaled orthogonal basis
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+from numpy.polynomial import chebyshev, legendre
+
+from gait import profiling
+
+_VANDER = {"chebyshev": chebyshev.chebvander, "legendre": legendre.legvander}
+
+# coef: (..., degree + 1) coefficients in `basis` on t mapped from `domain` to [-1, 1]
+PolynomialFit = namedtuple("PolynomialFit", ["coef", "domain", "basis"])
+
+
+def _scale(t, domain):
+    lo, hi = domain
+    return (2 * np.asarray(t, dtype=float) - (lo + hi)) / (hi - lo)
+
+
+@lru_cache(maxsize=64)
+def _qr(t_bytes, degree, basis):
+    # Thin QR of the Vandermonde matrix for one (t grid, degree, basis)
+    t = np.frombuffer(t_bytes)
+    vander = _VANDER[basis](_scale(t, (t[0], t[-1])), degree)
+    q, r = np.linalg.qr(vander)
+    q.flags.writeable = False
+    r.flags.writeable = False
+    return q, r
+
+
+def _factor(t, degree, basis):
+    t = np.ascontiguousarray(t, dtype=float)
+    if degree >= len(t):
+        raise ValueError(f"Degree {degree} needs more than {len(t)} samples")
+    return _qr(t.tobytes(), degree, basis)
+
+
+@profiling.timed("polyfit.fit")
+def fit_polynomials(t, signals, degree, basis="chebyshev"):
+    """Least-squares fit of every signal (last axis) sampled on the shared grid `t`.
+
+    The QR factorization is cached per (t, degree, basis), so a batch on the
+    same grid costs one matrix product and one triangular solve.
+    """
+    from scipy.linalg import solve_triangular
+
+    signals = np.asarray(signals, dtype=float)
+    q, r = _factor(t, degree, basis)
+    rhs = signals.reshape(-1, signals.shape[-1]).T
+    coef = solve_triangular(r, q.T @ rhs).T
+    return PolynomialFit(coef.reshape(signals.shape[:-1] + (degree + 1,)), (t[0], t[-1]), basis)
+
+
+def evaluate_polynomials(fit, t):
+    """Evaluate every fitted polynomial at `t` with one matrix product."""
+    vander = _VANDER[fit.basis](_scale(t, fit.domain), fit.coef.shape[-1] - 1)
+    return fit.coef @ vander.T
+
+
+def cross_validate_degrees(t, signals, degrees, basis="chebyshev"):
+    """Leave-one-out mean squared error of each degree, per signal.
+
+    Uses the closed form r_i / (1 - h_ii) with the hat-matrix diagonal from
+    the cached QR, so there is no refitting per left-out sample and the
+    result is deterministic. Returns an (n_degrees x ...) array, with inf
+    where a degree leaves no data to validate against.
+    """
+    signals = np.asarray(signals, dtype=float)
+    errors = []
+    for degree in degrees:
+        q, _ = _factor(t, degree, basis)
+        leverage = np.einsum("ij,ij->i", q, q)
+        residual = signals - (signals @ q) @ q.T
+        # A sample the fit interpolates exactly (h_ii == 1) makes the degree unusable
+        with np.errstate(divide="ignore", invalid="ignore"):
+            error = np.mean((residual / (1 - leverage)) ** 2, axis=-1)
+        errors.append(np.where(np.isfinite(error), error, np.inf))
+    return np.array(errors)
+
+
+def select_degree(t, signals, degrees=None, basis="chebyshev"):
+    """Degree with the lowest leave-one-out error summed over the batch."""
+    if degrees is None:
+        degrees = range(1, len(t) - 1)
+    degrees = list(degrees)
+    errors = cross_validate_degrees(t, signals, degrees, basis)
+    return degrees[int(np.argmin(errors.reshape(len(degrees), -1).sum(axis=1)))]
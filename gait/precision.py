@@ -0,0 +1,43 @@
+# Validation of reduced-precision reconstruction and kinematics against float64
+from collections import namedtuple
+
+import numpy as np
+
+from gait.kinematics import forward_kinematics
+from gait.reconstruction import reconstruct
+
+# angle_error: degrees, velocity_error/acceleration_error: relative to the
+# float64 peak, position_error: length units of L1/L2, nbytes: output bytes
+# of the reduced and the float64 run
+PrecisionReport = namedtuple("PrecisionReport", ["dtype", "angle_error", "velocity_error", "acceleration_error",
+                                                 "position_error", "nbytes", "nbytes_float64"])
+
+
+def _nbytes(*results):
+    return sum(a.nbytes for result in results for a in result)
+
+
+def compare_precision(angles, n_interp=500, L1=1.0, L2=1.0, dtype=np.float32):
+    """Maximum errors of a `dtype` spline reconstruction and leg kinematics against float64.
+
+    `angles` is (..., 4, n_samples) in `gait.data.JOINTS` order (hips,
+    then knees), as passed to `reconstruct`.
+    """
+    exact = reconstruct(angles, n_interp, dtype=np.float64)
+    reduced = reconstruct(angles, n_interp, dtype=dtype)
+    exact_positions = forward_kinematics(exact.radians[..., :2, :], exact.radians[..., 2:, :], L1, L2)
+    reduced_positions = forward_kinematics(reduced.radians[..., :2, :], reduced.radians[..., 2:, :], L1, L2)
+
+    def max_error(a, b, relative=False):
+        error = np.abs(a - b.astype(np.float64)).max()
+        return float(error / np.abs(a).max()) if relative else float(error)
+
+    return PrecisionReport(
+        np.dtype(dtype).name,
+        max_error(exact.degrees, reduced.degrees),
+        max_error(exact.velocity, reduced.velocity, relative=True),
+        max_error(exact.acceleration, reduced.acceleration, relative=True),
+        max(max_error(a, b) for a, b in zip(exact_positions, reduced_positions)),
+        _nbytes(reduced, reduced_positions),
+        _nbytes(exact, exact_positions),
+    )
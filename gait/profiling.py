@@ -0,0 +1,205 @@
+# Opt-in timers, counters and histograms for the load, fit, kinematics and render stages
+#
+# Profiling is off by default and every hook then costs one flag check. Set
+# GAIT_PROFILE=<path> to record a whole run and write it at exit, or wrap a
+# block in `with profile(path):`. Paths ending in ".trace.json" get a
+# Chrome trace (chrome://tracing, Perfetto), anything else a JSON summary.
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+ENV_VAR = "GAIT_PROFILE"
+
+enabled = False
+_active = None
+_NULL = nullcontext()
+
+
+def _peak_rss(who="self"):
+    # ru_maxrss is in kilobytes on Linux
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    return usage.ru_maxrss * 1024
+
+
+class Profiler:
+    """Spans, duration samples and counters recorded while profiling is on."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []      # (name, start, stop, thread id)
+        self.samples = {}    # name -> list of durations in seconds
+        self.counters = {}   # name -> total
+        self.counter_events = []  # (name, time, running total)
+        self.memory = []     # (time, peak rss in bytes)
+
+    def add_span(self, name, start, stop):
+        self.spans.append((name, start, stop, threading.get_ident()))
+        self.samples.setdefault(name, []).append(stop - start)
+        rss = _peak_rss()
+        if rss is not None and (not self.memory or rss > self.memory[-1][1]):
+            self.memory.append((stop, rss))
+
+    def add_samples(self, name, durations):
+        self.samples.setdefault(name, []).extend(durations)
+
+    def count(self, name, n=1):
+        total = self.counters.get(name, 0) + n
+        self.counters[name] = total
+        self.counter_events.append((name, time.perf_counter(), total))
+
+    def summary(self, bins=20):
+        """Per-stage statistics with a log-spaced duration histogram, counters and peak memory."""
+        stages = {}
+        for name, durations in self.samples.items():
+            d = np.asarray(durations)
+            low, high = max(d.min(), 1e-9), max(d.max(), 1e-9)
+            counts, edges = np.histogram(d, bins=np.geomspace(low, high * (1 + 1e-9), bins + 1))
+            p50, p95 = np.percentile(d, [50, 95])
+            stages[name] = {
+                "count": len(d), "total": float(d.sum()), "mean": float(d.mean()), "min": float(d.min()),
+                "p50": float(p50), "p95": float(p95), "max": float(d.max()),
+                "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+            }
+        return {
+            "wall_seconds": time.perf_counter() - self.origin,
+            "stages": stages,
+            "counters": dict(self.counters),
+            "peak_rss_bytes": _peak_rss(),
+            "children_peak_rss_bytes": _peak_rss("children"),
+        }
+
+    def chrome_trace(self):
+        """Events in the Chrome trace format (microsecond timestamps)."""
+        pid = os.getpid()
+
+        def us(t):
+            return (t - self.origin) * 1e6
+
+        events = [{"name": name, "ph": "X", "ts": us(start), "dur": (stop - start) * 1e6, "pid": pid, "tid": tid}
+                  for name, start, stop, tid in self.spans]
+        events += [{"name": name, "ph": "C", "ts": us(t), "pid": pid, "args": {name: total}}
+                   for name, t, total in self.counter_events]
+        events += [{"name": "peak_rss", "ph": "C", "ts": us(t), "pid": pid, "args": {"bytes": rss}}
+                   for t, rss in self.memory]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        data = self.chrome_trace() if str(path).endswith(".trace.json") else self.summary()
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _active.add_span(self.name, self.start, time.perf_counter())
+
+
+def timer(name):
+    """Context manager timing a stage; a shared no-op when profiling is off."""
+    return _Span(name) if enabled else _NULL
+
+
+def timed(name):
+    """Decorator form of `timer`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1):
+    """Add `n` to a counter."""
+    if enabled:
+        _active.count(name, n)
+
+
+def record(name, durations):
+    """Add durations measured elsewhere (e.g. in worker processes) to a stage's samples."""
+    if enabled and durations:
+        _active.add_samples(name, durations)
+
+
+def progress_timer(name):
+    """`progress_callback` for `Animation.save` recording the time between saved frames.
+
+    Returns None when profiling is off, which `save` accepts as no callback.
+    """
+    if not enabled:
+        return None
+    last = [time.perf_counter()]
+
+    def callback(i, n):
+        now = time.perf_counter()
+        _active.add_span(name, last[0], now)
+        last[0] = now
+
+    return callback
+
+
+def start():
+    """Turn profiling on with a fresh Profiler and return it."""
+    global enabled, _active
+    _active = Profiler()
+    enabled = True
+    return _active
+
+
+def stop():
+    """Turn profiling off and return the Profiler that was recording."""
+    global enabled, _active
+    profiler, _active, enabled = _active, None, False
+    return profiler
+
+
+@contextmanager
+def profile(path=None):
+    """Record the enclosed block; written to `path` on exit when given."""
+    profiler = start()
+    try:
+        yield profiler
+    finally:
+        stop()
+        if path is not None:
+            profiler.write(path)
+
+
+def _write_at_exit(path, pid):
+    # Worker processes inherit the flag and return their frame times to the
+    # parent; only the process that started profiling writes the file
+    if os.getpid() != pid:
+        return
+    profiler = stop()
+    if profiler is not None:
+        profiler.write(path)
+
+
+if os.environ.get(ENV_VAR):
+    start()
+    atexit.register(_write_at_exit, os.environ[ENV_VAR], os.getpid())
@@ -0,0 +1,66 @@
+# Batched cubic-spline reconstruction of joint-angle cycles
+from collections import namedtuple
+
+import numpy as np
+
+from gait import profiling
+
+# t: evaluation grid, degrees/radians: reconstructed angles,
+# velocity/acceleration: d(theta)/dt in rad/s and d2(theta)/dt2 in rad/s^2
+Reconstruction = namedtuple("Reconstruction", ["t", "degrees", "radians", "velocity", "acceleration"])
+
+
+def evaluate_with_derivatives(spline, t, dtype=np.float64):
+    """Value, first and second derivative of a cubic `PPoly` at `t` in one pass.
+
+    The interval lookup is done once and all three come from the same
+    piecewise coefficients, batched over every trailing axis of the spline.
+    Returns three arrays shaped (len(t), *spline.c.shape[2:]) computed in
+    `dtype` throughout.
+    """
+    x = spline.x.astype(dtype, copy=False)
+    c = spline.c.astype(dtype, copy=False)
+    t = np.asarray(t, dtype=dtype)
+    interval = np.clip(np.searchsorted(x, t, side="right") - 1, 0, len(x) - 2)
+    dx = (t - x[interval]).reshape((-1,) + (1,) * (c.ndim - 2))
+    c3, c2, c1, c0 = c[:, interval]
+    value = ((c3 * dx + c2) * dx + c1) * dx + c0
+    slope = (3 * c3 * dx + 2 * c2) * dx + c1
+    curvature = 6 * c3 * dx + 2 * c2
+    return value, slope, curvature
+
+
+def reconstruct(angles, n_interp=500, t=None, t_interp=None, dtype=np.float64):
+    """Fit and evaluate cubic splines for every trial and joint in one pass.
+
+    Velocities and accelerations are the spline's analytic derivatives,
+    evaluated together with the angles.
+
+    `angles` is an (n_trials x n_joints x n_samples) array in degrees (any
+    leading shape works, the samples are always on the last axis). The
+    samples are assumed to be evenly spaced over a cycle normalized to
+    0..1 unless `t` is given.
+
+    `dtype` sets the precision of the evaluation and of every returned
+    array. The fit itself is a small float64 solve per joint; with float32
+    only its coefficients are cast, and the evaluation, the conversion to
+    radians and the derivatives all stay in float32.
+    """
+    from scipy.interpolate import CubicSpline
+
+    angles = np.asarray(angles, dtype=float)
+    if t is None:
+        t = np.linspace(0, 1, angles.shape[-1])
+    if t_interp is None:
+        t_interp = np.linspace(t[0], t[-1], n_interp)
+
+    # One CubicSpline over the last axis solves all the tridiagonal systems together
+    with profiling.timer("reconstruct.fit"):
+        spline = CubicSpline(t, angles, axis=-1)
+    with profiling.timer("reconstruct.evaluate"):
+        degrees, slope, curvature = (np.moveaxis(a, 0, -1)
+                                     for a in evaluate_with_derivatives(spline, t_interp, dtype))
+
+    # Convert to radians (the derivatives scale the same way)
+    radians = np.deg2rad(degrees)
+    return Reconstruction(np.asarray(t_interp, dtype=dtype), degrees, radians, np.deg2rad(slope), np.deg2rad(curvature))
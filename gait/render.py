@@ -0,0 +1,177 @@
+# Headless, multi-process video rendering of animation scenes
+import os
+import subprocess
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gait import profiling
+
+
+def _make_canvas(scene):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    # Agg canvas without pyplot, so workers never touch a GUI backend
+    fig = Figure(figsize=scene.figsize, dpi=scene.dpi)
+    canvas = FigureCanvasAgg(fig)
+    init, update = scene.draw_on(fig)
+    init()
+    return canvas, update
+
+
+def _rgb_frame(canvas):
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())[..., :3].tobytes()
+
+
+def _draw_frames(canvas, update, start, stop):
+    # Yields the RGB bytes of frames [start, stop); when profiling, the
+    # per-frame draw times are appended to the returned list for the parent
+    times = []
+
+    def frames():
+        if not profiling.enabled:
+            for i in range(start, stop):
+                update(i)
+                yield _rgb_frame(canvas)
+            return
+        for i in range(start, stop):
+            t0 = time.perf_counter()
+            update(i)
+            frame = _rgb_frame(canvas)
+            times.append(time.perf_counter() - t0)
+            yield frame
+
+    return frames(), times
+
+
+def _render_chunk(scene, start, stop):
+    # Returns the raw RGB bytes for frames [start, stop) and their draw times
+    canvas, update = _make_canvas(scene)
+    frames, times = _draw_frames(canvas, update, start, stop)
+    return b"".join(frames), times
+
+
+def _encode_command(ffmpeg, size, fps, output):
+    width, height = size
+    return [
+        ffmpeg, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps),
+        "-i", "-",
+        "-vcodec", "libx264", "-pix_fmt", "yuv420p",
+        output,
+    ]
+
+
+def _stop_encoder(proc):
+    # Kill an ffmpeg that is still running after a failure, so it never outlives the render
+    if proc.poll() is None:
+        proc.kill()
+        proc.wait()
+
+
+def _render_segment(scene, start, stop, size, fps, output, ffmpeg):
+    # Renders frames [start, stop) straight into an encoded segment file
+    canvas, update = _make_canvas(scene)
+    proc = subprocess.Popen(_encode_command(ffmpeg, size, fps, output), stdin=subprocess.PIPE)
+    try:
+        frames, times = _draw_frames(canvas, update, start, stop)
+        for frame in frames:
+            proc.stdin.write(frame)
+        proc.stdin.close()
+        if proc.wait():
+            raise RuntimeError(f"ffmpeg failed encoding frames {start}-{stop}")
+    finally:
+        _stop_encoder(proc)
+    return output, times
+
+
+def render_parallel(scene, output, fps=30, workers=None, chunk_size=None,
+                    mode="pipe", ffmpeg="ffmpeg", buffer_bytes=256 * 2 ** 20):
+    """Render every frame of `scene` to `output` using a pool of processes.
+
+    `scene` must be picklable and provide `figsize`, `dpi`, `n_frames` and
+    `draw_on(fig) -> (init, update)`. The frame range is split into chunks
+    drawn with Agg in worker processes. In "pipe" mode the raw RGB frames
+    are streamed, in order, to a single ffmpeg process; in "segments" mode
+    each chunk is encoded by its worker and the segments are concatenated.
+    In pipe mode at most 2 * workers chunks are in flight, and chunks are
+    kept small enough that those hold no more than `buffer_bytes` of raw
+    frames, however long the video is.
+
+    Returns a dict with the frame count, wall time, fps and worker count.
+    """
+    workers = workers or os.cpu_count()
+    n_frames = scene.n_frames
+    if chunk_size is None:
+        # A few chunks per worker keeps the pool busy until the end
+        chunk_size = max(1, -(-n_frames // (workers * 4)))
+    size = _make_canvas(scene)[0].get_width_height()
+    if mode == "pipe":
+        frame_bytes = size[0] * size[1] * 3
+        chunk_size = min(chunk_size, max(1, buffer_bytes // (2 * workers * frame_bytes)))
+    chunks = [(start, min(start + chunk_size, n_frames)) for start in range(0, n_frames, chunk_size)]
+
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        if mode == "pipe":
+            # Queue the first chunks before starting ffmpeg: the pool forks its
+            # workers on the first submit and they must not inherit the pipe,
+            # otherwise ffmpeg never sees EOF.
+            pending = deque()
+            queued = iter(chunks)
+            for start, stop in queued:
+                pending.append(pool.submit(_render_chunk, scene, start, stop))
+                if len(pending) >= 2 * workers:
+                    break
+            proc = subprocess.Popen(_encode_command(ffmpeg, size, fps, output), stdin=subprocess.PIPE)
+
+            def write_next():
+                with profiling.timer("render.wait"):
+                    frames, times = pending.popleft().result()
+                profiling.record("render.frame", times)
+                with profiling.timer("render.encode"):
+                    proc.stdin.write(frames)
+
+            try:
+                # Only keep a bounded number of rendered chunks in flight
+                for start, stop in queued:
+                    write_next()
+                    pending.append(pool.submit(_render_chunk, scene, start, stop))
+                while pending:
+                    write_next()
+                with profiling.timer("render.encode"):
+                    proc.stdin.close()
+                    if proc.wait():
+                        raise RuntimeError("ffmpeg failed encoding the rendered frames")
+            finally:
+                # On failure drop the queued chunks and stop the encoder
+                for future in pending:
+                    future.cancel()
+                _stop_encoder(proc)
+        elif mode == "segments":
+            with tempfile.TemporaryDirectory() as tmp:
+                segments = [os.path.join(tmp, f"segment_{k:05d}.mp4") for k in range(len(chunks))]
+                futures = [pool.submit(_render_segment, scene, start, stop, size, fps, path, ffmpeg)
+                           for (start, stop), path in zip(chunks, segments)]
+                listing = os.path.join(tmp, "segments.txt")
+                with open(listing, "w") as f:
+                    for future in futures:
+                        with profiling.timer("render.wait"):
+                            path, times = future.result()
+                        profiling.record("render.frame", times)
+                        f.write(f"file '{path}'\n")
+                with profiling.timer("render.encode"):
+                    subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                                    "-i", listing, "-c", "copy", output], check=True)
+        else:
+            raise ValueError(f"Unknown render mode: {mode!r}")
+    seconds = time.perf_counter() - start_time
+    profiling.count("render.frames", n_frames)
+
+    return {"frames": n_frames, "seconds": seconds, "fps": n_frames / seconds, "workers": workers}
+
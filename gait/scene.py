@@ -0,0 +1,74 @@
+# Figure setup and frame callbacks for the double-pendulum leg animation
+from gait import profiling
+
+
+class DoublePendulumScene:
+    """Both legs drawn as double pendulums from precomputed polylines.
+
+    `leg_x`/`leg_y` come from `gait.kinematics.leg_polylines` with shape
+    (2 x n_frames x 3) for the left and right leg. The scene only holds
+    arrays, so it can be pickled and rebuilt in render worker processes.
+    """
+
+    figsize = (6.4, 4.8)
+    dpi = 100
+
+    def __init__(self, leg_x, leg_y, xlim=(-2.5, 2.5), ylim=(-2.5, 1)):
+        self.leg_x = leg_x
+        self.leg_y = leg_y
+        self.xlim = xlim
+        self.ylim = ylim
+
+    @property
+    def n_frames(self):
+        return self.leg_x.shape[1]
+
+    def draw_on(self, fig):
+        """Create the axes and artists on `fig` and return the (init, animate) callbacks."""
+        leg_x, leg_y = self.leg_x, self.leg_y
+
+        ax = fig.add_subplot(1, 1, 1)
+        ax.set_xlim(*self.xlim)
+        ax.set_ylim(*self.ylim)
+        ax.set_xlabel('X (m)')
+        ax.set_ylabel('Y (m)')
+        ax.set_title('Double Pendulum Animation for Both Legs')
+        ax.grid(True)
+
+        # Create line objects for the rods and masses
+        rod_left_hip, = ax.plot([], [], 'b-', lw=2)
+        rod_left_knee, = ax.plot([], [], 'g-', lw=2)
+        rod_right_hip, = ax.plot([], [], 'r-', lw=2)
+        rod_right_knee, = ax.plot([], [], 'y-', lw=2)
+
+        mass_left_hip, = ax.plot([], [], 'bo', markersize=10, markerfacecolor='b')
+        mass_left_knee, = ax.plot([], [], 'go', markersize=10, markerfacecolor='g')
+        mass_right_hip, = ax.plot([], [], 'ro', markersize=10, markerfacecolor='r')
+        mass_right_knee, = ax.plot([], [], 'yo', markersize=10, markerfacecolor='y')
+
+        artists = (rod_left_hip, rod_left_knee, rod_right_hip, rod_right_knee,
+                   mass_left_hip, mass_left_knee, mass_right_hip, mass_right_knee)
+
+        def init():
+            for artist in artists:
+                artist.set_data([], [])
+            return artists
+
+        def animate(i):
+            # Update rod positions
+            rod_left_hip.set_data(leg_x[0, i, :2], leg_y[0, i, :2])
+            rod_left_knee.set_data(leg_x[0, i, 1:], leg_y[0, i, 1:])
+            rod_right_hip.set_data(leg_x[1, i, :2], leg_y[1, i, :2])
+            rod_right_knee.set_data(leg_x[1, i, 1:], leg_y[1, i, 1:])
+
+            # Update mass positions (slices keep these as sequences)
+            mass_left_hip.set_data(leg_x[0, i, 1:2], leg_y[0, i, 1:2])
+            mass_left_knee.set_data(leg_x[0, i, 2:], leg_y[0, i, 2:])
+            mass_right_hip.set_data(leg_x[1, i, 1:2], leg_y[1, i, 1:2])
+            mass_right_knee.set_data(leg_x[1, i, 2:], leg_y[1, i, 2:])
+
+            return artists
+
+        if profiling.enabled:
+            animate = profiling.timed("render.animate")(animate)
+        return init, animate
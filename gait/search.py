@@ -0,0 +1,255 @@
+# k-nearest-neighbour search over gait cycles by low-order Fourier features
+#
+# Each cycle is reduced to a short float32 vector, [a0, an / sqrt(2),
+# bn / sqrt(2)] / sqrt(n_joints) for every joint. With that scaling the
+# Euclidean distance between two vectors is the RMS difference (in degrees,
+# over all joints and the whole cycle) between the two cycles low-passed to
+# `n_terms` harmonics (Parseval), so queries never touch the raw samples.
+# Queries are an exact blocked scan or, once the index is trained, an
+# inverted-file search over k-means cells.
+import os
+import tempfile
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from gait import profiling
+from gait.fourier import fourier_coefficients
+
+# ids/distances: (n_queries x k), nearest first; distances are RMS degrees
+# over all joints and the cycle; k shrinks to the index size when it is smaller.
+# Approximate queries whose probed cells hold fewer than k cycles pad the
+# remaining slots with id -1 and distance inf
+SearchResult = namedtuple("SearchResult", ["ids", "distances"])
+
+
+def coefficient_features(coefficients):
+    """(... x n_features) float32 vectors from `FourierCoefficients` of (... x joints) cycles."""
+    a0, an, bn = coefficients
+    a0 = np.asarray(a0)[..., None]
+    per_joint = np.concatenate([a0, an / np.sqrt(2), bn / np.sqrt(2)], axis=-1)
+    per_joint /= np.sqrt(per_joint.shape[-2])
+    return per_joint.reshape(per_joint.shape[:-2] + (-1,)).astype(np.float32)
+
+
+def cycle_features(angles, n_terms=4, closed=True):
+    """Feature vectors of (... x joints x samples) cycles, e.g. the output of `reconstruct`.
+
+    With `closed` the last sample repeats the first one (a 0..100% grid)
+    and is left out of the DFT.
+    """
+    angles = np.asarray(angles)
+    if closed:
+        angles = angles[..., :-1]
+    return coefficient_features(fourier_coefficients(angles, n_terms))
+
+
+def _top_k(distances, k):
+    # Column indices of the k smallest entries of every row, nearest first
+    k = min(k, distances.shape[-1])
+    part = np.argpartition(distances, k - 1, axis=-1)[..., :k]
+    order = np.take_along_axis(distances, part, axis=-1).argsort(axis=-1)
+    return np.take_along_axis(part, order, axis=-1)
+
+
+def _squared_distances(queries, query_norms, features, norms):
+    return norms - 2 * queries @ features.T + query_norms[:, None]
+
+
+class SimilarityIndex:
+    """Growable index of cycle feature vectors with exact and approximate k-NN queries.
+
+    Inserts are amortized O(1) (capacity doubles). `train()` clusters the
+    vectors into `n_lists` cells; approximate queries then only scan the
+    `n_probe` cells nearest to the query. Vectors inserted after training
+    are assigned to their nearest cell.
+    """
+
+    def __init__(self, n_terms=4, block_rows=65536):
+        self.n_terms = n_terms
+        self.block_rows = block_rows
+        self._n = 0
+        self._features = None
+        self._norms = np.empty(0, dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self.centroids = None
+        self._cells = np.empty(0, dtype=np.int32)
+        self._lists = None  # (row order grouped by cell, cell bounds), rebuilt after inserts
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def features(self):
+        return self._features[:self._n]
+
+    @property
+    def ids(self):
+        return self._ids[:self._n]
+
+    def reserve(self, n_new, n_features):
+        """Make room for `n_new` more vectors up front, e.g. before a large bulk load."""
+        if self._features is None:
+            self._features = np.empty((0, n_features), dtype=np.float32)
+        elif self._features.shape[1] != n_features:
+            raise ValueError(f"Expected {self._features.shape[1]} features per cycle, got {n_features}")
+        needed = self._n + n_new
+        if needed <= len(self._features):
+            return
+        capacity = max(needed, 2 * len(self._features))
+        for name in ("_features", "_norms", "_ids", "_cells"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def add_features(self, features, ids=None):
+        """Insert (n x n_features) vectors; returns their ids (consecutive by default)."""
+        features = np.atleast_2d(np.asarray(features, dtype=np.float32))
+        n_new = len(features)
+        if ids is None:
+            ids = np.arange(self._n, self._n + n_new)
+        self.reserve(n_new, features.shape[1])
+        rows = slice(self._n, self._n + n_new)
+        self._features[rows] = features
+        self._norms[rows] = np.einsum("ij,ij->i", features, features)
+        self._ids[rows] = ids
+        if self.centroids is not None:
+            self._cells[rows] = self._assign(features)
+            self._lists = None
+        self._n += n_new
+        profiling.count("search.inserts", n_new)
+        return np.asarray(ids)
+
+    def add(self, angles, ids=None, closed=True):
+        """Insert (n x joints x samples) cycles; see `cycle_features`."""
+        return self.add_features(cycle_features(angles, self.n_terms, closed), ids)
+
+    def _assign(self, features):
+        # Nearest centroid of every row, in blocks to bound the distance matrix
+        cell_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+        cells = np.empty(len(features), dtype=np.int32)
+        for start in range(0, len(features), self.block_rows):
+            block = features[start:start + self.block_rows]
+            cells[start:start + len(block)] = (cell_norms - 2 * block @ self.centroids.T).argmin(axis=1)
+        return cells
+
+    def train(self, n_lists=None, sample_size=65536, iterations=10, seed=0):
+        """Cluster the indexed vectors into `n_lists` cells (default sqrt(n), at most 1024) for approximate queries."""
+        if n_lists is None:
+            n_lists = int(np.clip(np.sqrt(self._n), 1, 1024))
+        rng = np.random.default_rng(seed)
+        features = self.features
+        sample = features[np.sort(rng.choice(self._n, min(self._n, max(sample_size, n_lists)), replace=False))]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+
+        # Lloyd iterations on the sample; empty cells are reseeded from random samples
+        with profiling.timer("search.train"):
+            for _ in range(iterations):
+                self.centroids = centroids
+                labels = self._assign(sample)
+                counts = np.bincount(labels, minlength=n_lists)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                empty = counts == 0
+                centroids = sums / np.maximum(counts, 1)[:, None]
+                centroids[empty] = sample[rng.choice(len(sample), empty.sum())]
+            self.centroids = centroids.astype(np.float32)
+            self._cells[:self._n] = self._assign(features)
+        self._lists = None
+
+    def _cell_lists(self):
+        if self._lists is None:
+            cells = self._cells[:self._n]
+            order = np.argsort(cells, kind="stable")
+            bounds = np.searchsorted(cells[order], np.arange(len(self.centroids) + 1))
+            self._lists = order, bounds
+        return self._lists
+
+    def query_features(self, queries, k=5, approximate=False, n_probe=8):
+        """k nearest indexed cycles to each (n_queries x n_features) query vector.
+
+        Distances are the RMS angle difference in degrees over all joints and
+        the low-passed cycle. An empty index returns (n_queries x 0) results;
+        slots an approximate query cannot fill have id -1 and distance inf.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if not self._n:
+            return SearchResult(np.empty((len(queries), 0), dtype=np.int64),
+                                np.empty((len(queries), 0), dtype=np.float32))
+        query_norms = np.einsum("ij,ij->i", queries, queries)
+        if approximate:
+            if self.centroids is None:
+                raise ValueError("Approximate queries need a trained index, call train() first")
+            with profiling.timer("search.approximate"):
+                rows, distances = self._probe(queries, query_norms, k, n_probe)
+        else:
+            with profiling.timer("search.exact"):
+                rows, distances = self._scan(queries, query_norms, k)
+        # The expanded form ranks quickly but cancels for close matches, so the
+        # returned distances are recomputed directly from the differences
+        exact = np.linalg.norm(self._features[rows] - queries[:, None], axis=-1)
+        found = np.isfinite(distances)
+        return SearchResult(np.where(found, self._ids[rows], -1), np.where(found, exact, np.inf))
+
+    def query(self, angles, k=5, approximate=False, n_probe=8, closed=True):
+        """k nearest indexed cycles to each of (n_queries x joints x samples) cycles."""
+        return self.query_features(cycle_features(angles, self.n_terms, closed), k, approximate, n_probe)
+
+    def _scan(self, queries, query_norms, k):
+        # Top k of every block, then the top k of those candidates
+        candidate_rows, candidate_distances = [], []
+        for start in range(0, self._n, self.block_rows):
+            stop = min(start + self.block_rows, self._n)
+            distances = _squared_distances(queries, query_norms, self._features[start:stop], self._norms[start:stop])
+            best = _top_k(distances, k)
+            candidate_rows.append(best + start)
+            candidate_distances.append(np.take_along_axis(distances, best, axis=-1))
+        rows = np.concatenate(candidate_rows, axis=1)
+        distances = np.concatenate(candidate_distances, axis=1)
+        best = _top_k(distances, k)
+        return np.take_along_axis(rows, best, axis=-1), np.take_along_axis(distances, best, axis=-1)
+
+    def _probe(self, queries, query_norms, k, n_probe):
+        order, bounds = self._cell_lists()
+        n_probe = min(n_probe, len(self.centroids))
+        cells = _top_k(_squared_distances(queries, query_norms, self.centroids,
+                                          np.einsum("ij,ij->i", self.centroids, self.centroids)), n_probe)
+        k = min(k, self._n)
+        rows = np.zeros((len(queries), k), dtype=np.int64)
+        distances = np.full((len(queries), k), np.inf, dtype=np.float32)
+        for q, probe in enumerate(cells):
+            candidates = np.concatenate([order[bounds[c]:bounds[c + 1]] for c in probe])
+            if not len(candidates):
+                continue
+            d = _squared_distances(queries[q:q + 1], query_norms[q:q + 1],
+                                   self._features[candidates], self._norms[candidates])[0]
+            best = _top_k(d, k)
+            rows[q, :len(best)] = candidates[best]
+            distances[q, :len(best)] = d[best]
+        return rows, distances
+
+    def save(self, path):
+        """Write the index to an .npz file, atomically replacing any existing one."""
+        path = Path(path)
+        arrays = {"features": self.features, "ids": self.ids, "n_terms": self.n_terms}
+        if self.centroids is not None:
+            arrays.update(centroids=self.centroids, cells=self._cells[:self._n])
+        # Write to a temporary file first so readers never see a partial index
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, block_rows=65536):
+        """Index saved with `save`; further inserts append to it as usual."""
+        with np.load(path) as data:
+            index = cls(int(data["n_terms"]), block_rows)
+            if len(data["features"]):
+                index.add_features(data["features"], data["ids"])
+            if "centroids" in data:
+                index.centroids = data["centroids"]
+                index._cells[:index._n] = data["cells"]
+        return index
@@ -0,0 +1,118 @@
+# Gait-cycle segmentation of continuous recordings
+#
+# Cycle boundaries are taken at the hip-flexion minima (around heel strike
+# in these recordings, where every sample cycle starts). Detection is a
+# single pass over the stream; the resulting CycleIndex gives O(1) access
+# to any cycle and resamples cycles to 0-100% of the gait cycle in one
+# vectorized operation.
+import numpy as np
+
+
+def _hip_minima(hip, threshold):
+    # Indices i with hip[i-1] > hip[i] <= hip[i+1] below the threshold (scalar or per sample)
+    d = np.diff(hip)
+    minima = np.flatnonzero((d[:-1] < 0) & (d[1:] >= 0)) + 1
+    return minima[hip[minima] < np.broadcast_to(threshold, hip.shape)[minima]]
+
+
+def find_cycle_starts(blocks, joint=0, min_period=20, threshold=None):
+    """Sample offsets of every cycle start in a stream of (n_joints x n) blocks.
+
+    Starts are hip-flexion minima of row `joint` lying below `threshold`.
+    A new start also needs the signal to have risen above the threshold
+    since the previous one and to be at least `min_period` samples after
+    it; otherwise the lower of the two minima wins. When `threshold` is
+    None each sample is compared with the mid-range of every sample up to
+    it, a running level that does not depend on how the stream is split
+    into blocks. Rises within the first `min_period` samples do not count,
+    so noise dips seen before the level has settled (e.g. a recording that
+    begins mid-stance) never become starts.
+    """
+    starts = []
+    offset = 0  # Absolute offset of the first sample in `hip`
+    tail = np.empty(0)
+    tail_level = np.empty(0)
+    low, high = np.inf, -np.inf  # Range of the samples seen so far
+    last_above = -1  # Last sample above the level
+    for block in blocks:
+        if block.shape[-1] == 0:
+            continue
+        hip = np.concatenate([tail, block[joint]])
+        level = threshold
+        if level is None:
+            running_low = np.minimum.accumulate(np.concatenate([[low], block[joint]]))[1:]
+            running_high = np.maximum.accumulate(np.concatenate([[high], block[joint]]))[1:]
+            low, high = running_low[-1], running_high[-1]
+            level = np.concatenate([tail_level, (running_low + running_high) / 2])
+            tail_level = level[-2:]
+        above = np.flatnonzero(hip > level) + offset
+        # The running level only settles once a period has been seen
+        above = above[above >= min_period]
+        for i in _hip_minima(hip, level) + offset:
+            k = np.searchsorted(above, i)
+            risen = above[k - 1] if k else last_above
+            if starts and (i - starts[-1] < min_period or risen < starts[-1]):
+                if hip[i - offset] < last_value:
+                    starts[-1], last_value = i, hip[i - offset]
+                continue
+            starts.append(i)
+            last_value = hip[i - offset]
+        if len(above):
+            last_above = above[-1]
+        # Keep two samples so minima on the block boundary are still seen
+        tail = hip[-2:]
+        offset += len(hip) - len(tail)
+    return np.asarray(starts, dtype=np.int64)
+
+
+class CycleIndex:
+    """Start/end sample offsets of consecutive cycles in one recording.
+
+    Cycle `k` spans samples `starts[k]` to `ends[k]` inclusive, where each
+    end is the next cycle's start.
+    """
+
+    def __init__(self, starts):
+        starts = np.asarray(starts, dtype=np.int64)
+        self.starts = starts[:-1]
+        self.ends = starts[1:]
+
+    @classmethod
+    def from_blocks(cls, blocks, joint=0, min_period=20, threshold=None):
+        return cls(find_cycle_starts(blocks, joint, min_period, threshold))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, k):
+        return slice(int(self.starts[k]), int(self.ends[k]) + 1)
+
+    @property
+    def lengths(self):
+        return self.ends - self.starts
+
+    def cycle(self, data, k):
+        """Raw samples of cycle `k` from (n_joints x n_samples) `data`."""
+        return data[..., self[k]]
+
+    def normalize(self, data, n_points=51, cycles=None):
+        """Time-normalize cycles to `n_points` samples spanning 0-100%.
+
+        `data` is (n_joints x n_samples) and may be a memory-mapped view;
+        `cycles` selects a subset of cycle numbers. Returns an
+        (n_cycles x n_joints x n_points) array, linearly resampled in one
+        vectorized gather.
+        """
+        starts, ends = self.starts, self.ends
+        if cycles is not None:
+            starts, ends = starts[cycles], ends[cycles]
+        u = np.linspace(0, 1, n_points)
+        position = starts[:, None] + u * (ends - starts)[:, None]
+        i0 = np.minimum(np.floor(position).astype(np.int64), ends[:, None] - 1)
+        frac = position - i0
+
+        # Only the samples that are actually needed are read from `data`
+        lo = np.asarray(data[..., i0.ravel()]).reshape(data.shape[:-1] + i0.shape)
+        hi = np.asarray(data[..., i0.ravel() + 1]).reshape(data.shape[:-1] + i0.shape)
+        resampled = lo + (hi - lo) * frac
+        return np.moveaxis(resampled, -2, 0)
@@ -0,0 +1,106 @@
+# Memoized cubic splines with an LRU memory budget
+#
+# Splines are keyed by a hash of their knots, data and boundary condition.
+# A spline is only fitted when it is first evaluated away from its knots,
+# and evaluations are memoized per grid, so repeated reconstructions at the
+# same resolution are dictionary lookups.
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from gait import profiling
+
+
+def _digest(array):
+    array = np.ascontiguousarray(array, dtype=float)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(array.shape).encode())
+    h.update(array.tobytes())
+    return h.hexdigest()
+
+
+class SplineCache:
+    """LRU store of fitted splines and their evaluations, bounded by `max_bytes`."""
+
+    def __init__(self, max_bytes=64 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key, build, size):
+        """Value for `key`, calling `build()` on a miss; `size(value)` gives its bytes."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            profiling.count("splinecache.hits")
+            return self._entries[key][0]
+        self.misses += 1
+        profiling.count("splinecache.misses")
+        with profiling.timer("splinecache.build"):
+            value = build()
+        nbytes = size(value)
+        self._entries[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def spline(self, t, y, bc_type="not-a-knot", axis=-1):
+        return LazySpline(self, t, y, bc_type, axis)
+
+
+class LazySpline:
+    """Cubic spline through (t, y) that is fitted on first use and memoized in a SplineCache."""
+
+    def __init__(self, cache, t, y, bc_type="not-a-knot", axis=-1):
+        self.cache = cache
+        self.t = np.asarray(t, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.bc_type = bc_type
+        self.axis = axis
+        self._t_key = _digest(self.t)
+        self.key = (self._t_key, _digest(self.y), str(bc_type), axis)
+
+    def fitted(self):
+        """The underlying CubicSpline, fitted now unless it is already cached."""
+        from scipy.interpolate import CubicSpline
+
+        return self.cache.get(
+            ("spline",) + self.key,
+            lambda: CubicSpline(self.t, self.y, axis=self.axis, bc_type=self.bc_type),
+            lambda s: s.c.nbytes + s.x.nbytes,
+        )
+
+    def __call__(self, t_new, nu=0):
+        t_new = np.asarray(t_new, dtype=float)
+        # On the knot grid a spline reproduces its data, so there is nothing to fit;
+        # hand out a read-only view like the cached evaluations below
+        if nu == 0 and t_new.shape == self.t.shape and _digest(t_new) == self._t_key:
+            values = self.y.view()
+            values.flags.writeable = False
+            return values
+        return self.cache.get(("eval", nu, _digest(t_new)) + self.key, lambda: self._evaluate(t_new, nu),
+                              lambda values: values.nbytes)
+
+    def _evaluate(self, t_new, nu):
+        values = self.fitted()(t_new, nu)
+        # Cached results are shared between callers, so they must not be modified in place
+        values.flags.writeable = False
+        return values
+
+
+# Shared cache used by cached_spline
+default_cache = SplineCache()
+
+
+def cached_spline(t, y, bc_type="not-a-knot", axis=-1):
+    """LazySpline backed by the module-wide default cache."""
+    return default_cache.spline(t, y, bc_type, axis)
@@ -0,0 +1,85 @@
+# Real-time reconstruction of joint angles from a live sensor feed
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from gait.kinematics import forward_kinematics
+
+# angles: degrees, velocity: rad/s, positions: LegPositions for the (left, right) legs
+StreamFrame = namedtuple("StreamFrame", ["angles", "velocity", "positions"])
+
+
+class StreamingReconstructor:
+    """Sliding-window cubic reconstruction of a multi-joint sample stream.
+
+    Each output comes from a local cubic least-squares fit over the last
+    `window` samples, evaluated `lag` samples behind the newest one (0 is
+    causal, `window // 2` is a centered fit). The fit is linear in the
+    samples, so its value and derivative reduce to two precomputed weight
+    vectors and every update costs O(window) per joint, independent of how
+    long the stream has run.
+
+    Joints are rows in `gait.data.JOINTS` order (hips first, then knees),
+    which is what the forward kinematics expects; `with_positions=False`
+    skips the kinematics when a later stage computes them.
+    """
+
+    def __init__(self, n_joints=4, sample_rate=100.0, window=9, lag=0, degree=3, L1=1.0, L2=1.0,
+                 with_positions=True):
+        if window <= degree:
+            raise ValueError("window must be longer than the polynomial degree")
+        self.n_joints = n_joints
+        self.window = window
+        self.L1, self.L2 = L1, L2
+        self.with_positions = with_positions
+
+        # Weights giving the fitted value and slope at the evaluation sample
+        x = (np.arange(window) - (window - 1 - lag)) / sample_rate
+        weights = np.linalg.pinv(x[:, None] ** np.arange(degree + 1))
+        self._value_weights = weights[0]
+        self._slope_weights = weights[1]
+
+        # Ring buffer stored twice so the latest window is always contiguous
+        self._buffer = np.zeros((n_joints, 2 * window))
+        self._head = 0
+        self.count = 0
+
+    def _frame(self, angles, slope):
+        if not self.with_positions:
+            return StreamFrame(angles, np.deg2rad(slope), None)
+        # Joints on the first axis: hips are rows 0-1, knees rows 2-3
+        radians = np.deg2rad(angles)
+        positions = forward_kinematics(radians[:2], radians[2:4], self.L1, self.L2)
+        return StreamFrame(angles, np.deg2rad(slope), positions)
+
+    def push(self, sample):
+        """Add one sample (n_joints,) and return a StreamFrame, or None until the window fills."""
+        head = self._head
+        self._buffer[:, head] = sample
+        self._buffer[:, head + self.window] = sample
+        self._head = (head + 1) % self.window
+        self.count += 1
+        if self.count < self.window:
+            return None
+        recent = self._buffer[:, head + 1:head + 1 + self.window]
+        return self._frame(recent @ self._value_weights, recent @ self._slope_weights)
+
+    def push_block(self, block):
+        """Add an (n_joints x n) block and return a StreamFrame with one column per output."""
+        block = np.asarray(block, dtype=float)
+        n_held = min(self.count, self.window - 1)
+        recent = self._buffer[:, self._head + self.window - n_held:self._head + self.window]
+        history = np.concatenate([recent, block], axis=1)
+
+        # Advance the ring buffer to the end of the block
+        for sample in block[:, -self.window:].T:
+            self._buffer[:, self._head] = sample
+            self._buffer[:, self._head + self.window] = sample
+            self._head = (self._head + 1) % self.window
+        self.count += block.shape[1]
+
+        if history.shape[1] < self.window:
+            return None
+        windows = sliding_window_view(history, self.window, axis=1)
+        return self._frame(windows @ self._value_weights, windows @ self._slope_weights)
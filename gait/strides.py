@@ -0,0 +1,118 @@
+# Stride-level spatiotemporal metrics from foot trajectories
+#
+# Each row of the foot arrays is one stride (gait cycle) of the
+# double-pendulum leg with the hip fixed at the origin. The foot moves
+# forward relative to the hip during swing and backward during stance, so
+# the gait events are the extrema of the foot's horizontal position: heel
+# strike at the most forward point, toe off at the most backward one.
+import numpy as np
+
+# Columns of the stride table, in order
+COLUMNS = ("cycle", "heel_strike", "toe_off", "stride_length", "foot_clearance",
+           "stance_fraction", "stance_swing_ratio", "cadence", "crossings")
+
+# Peak frame-sized float64 arrays per stride while a chunk is evaluated: the
+# stance mask and masked heights, the centred positions and their closed
+# copy, and the sign mask with its difference
+_TEMPORARIES = 6
+
+
+def zero_crossings(x, axis=-1):
+    """Boolean mask of sign changes between consecutive samples along `axis` (one shorter)."""
+    sign = np.signbit(x)
+    return np.diff(sign, axis=axis)
+
+
+def cadence(duration):
+    """Steps per minute for strides of `duration` seconds (two steps per stride)."""
+    return 120.0 / np.asarray(duration, dtype=float)
+
+
+def _chunk_metrics(foot_x, foot_y):
+    # Per-stride events and extents of (n_strides x n_frames) foot positions
+    n_frames = foot_x.shape[-1]
+    heel_strike = foot_x.argmax(axis=-1)
+    toe_off = foot_x.argmin(axis=-1)
+    stance_frames = (toe_off - heel_strike) % n_frames
+
+    # Frames from heel strike (inclusive) to toe off (exclusive), wrapping around the cycle end
+    frame = np.arange(n_frames)
+    stance = (frame - heel_strike[:, None]) % n_frames < stance_frames[:, None]
+    ground = np.where(stance, foot_y, np.inf).min(axis=-1)
+    ground = np.where(np.isfinite(ground), ground, foot_y.min(axis=-1))
+    peak = np.where(stance, -np.inf, foot_y).max(axis=-1)
+    peak = np.where(np.isfinite(peak), peak, foot_y.max(axis=-1))
+    del stance
+
+    # Passes through the middle of the excursion, counted on the closed cycle
+    # so the wrap-around step is included; unlike reversals of the velocity
+    # this ignores small wobbles near the turning points
+    stride_length = foot_x.max(axis=-1) - foot_x.min(axis=-1)
+    centred = foot_x - (foot_x.min(axis=-1) + stride_length / 2)[:, None]
+    crossings = np.count_nonzero(zero_crossings(np.concatenate([centred, centred[:, :1]], axis=-1)), axis=-1)
+    return {
+        "heel_strike": heel_strike,
+        "toe_off": toe_off,
+        "stance_frames": stance_frames,
+        "stride_length": stride_length,
+        "foot_clearance": peak - ground,
+        "crossings": crossings,
+    }
+
+
+def stride_metrics(positions, duration=1.0, closed=False, memory_budget=16 * 2 ** 20):
+    """Columnar table of stride metrics from `gait.kinematics.LegPositions`.
+
+    The foot arrays are (..., n_frames) with one stride per row; all leading
+    axes are flattened into table rows. `duration` is the stride time in
+    seconds, scalar or one per stride. Set `closed` when the last frame
+    repeats the first (e.g. the 0..1 grid of `reconstruct`) so that it is
+    not counted twice.
+
+    Returns {column: 1-D array} with the columns of COLUMNS: event frame
+    indices, stride length (horizontal foot excursion), foot clearance
+    (peak swing height above the lowest stance point), stance fraction and
+    stance/swing ratio, cadence (steps/min) and the number of times the
+    foot passes the middle of its excursion, which is 2 for a regular stride.
+    Strides are processed in chunks whose working arrays fit in
+    `memory_budget` bytes, so time and memory grow linearly with the cohort.
+    """
+    foot_x = np.asarray(positions.foot_x)
+    foot_y = np.asarray(positions.foot_y)
+    n_frames = foot_x.shape[-1] - bool(closed)
+    foot_x = foot_x.reshape(-1, foot_x.shape[-1])[:, :n_frames]
+    foot_y = foot_y.reshape(-1, foot_y.shape[-1])[:, :n_frames]
+    n_strides = len(foot_x)
+
+    step = max(1, int(memory_budget) // (n_frames * _TEMPORARIES * 8))
+    columns = {}
+    # One pass even without strides, so every column exists
+    for start in range(0, max(n_strides, 1), step):
+        chunk = _chunk_metrics(foot_x[start:start + step], foot_y[start:start + step])
+        for name, value in chunk.items():
+            columns.setdefault(name, np.empty(n_strides, dtype=value.dtype))[start:start + len(value)] = value
+    stance_frames = columns["stance_frames"]
+
+    stance_fraction = stance_frames / n_frames
+    with np.errstate(divide="ignore"):
+        stance_swing_ratio = stance_frames / (n_frames - stance_frames)
+    duration = np.broadcast_to(np.asarray(duration, dtype=float).ravel(), (n_strides,))
+
+    return {
+        "cycle": np.arange(n_strides),
+        "heel_strike": columns["heel_strike"],
+        "toe_off": columns["toe_off"],
+        "stride_length": columns["stride_length"],
+        "foot_clearance": columns["foot_clearance"],
+        "stance_fraction": stance_fraction,
+        "stance_swing_ratio": stance_swing_ratio,
+        "cadence": cadence(duration),
+        "crossings": columns["crossings"],
+    }
+
+
+def write_table(path, table):
+    """Write a stride table as CSV with a header row."""
+    columns = [name for name in COLUMNS if name in table]
+    np.savetxt(path, np.column_stack([table[name] for name in columns]), delimiter=",",
+               header=",".join(columns), comments="", fmt="%.6g")
@@ -0,0 +1,105 @@
+# Parameter sweeps over the sinusoidal gait generator of simul_leg_paper.py
+#
+# Every configuration of a Cartesian grid is evaluated by broadcasting, in
+# chunks sized to a memory budget, and reduced to per-configuration summary
+# metrics; the per-frame trajectories of a chunk are discarded once reduced.
+from collections import namedtuple
+
+import numpy as np
+
+from gait.kinematics import forward_kinematics
+from gait.strides import cadence, stride_metrics
+
+# Grid axes in order: cycle duration (s), hip/knee amplitude and offset (degrees), thigh/shin length
+PARAMETERS = ("duration", "hip_amplitude", "hip_offset", "knee_amplitude", "knee_offset", "L1", "L2")
+
+# axes: {parameter: 1-D values}, metrics: {name: array shaped (len(axis) for axis in PARAMETERS)}
+SweepResult = namedtuple("SweepResult", ["axes", "metrics"])
+
+# Peak frame-sized float64 arrays per configuration while a chunk is
+# evaluated: hip and knee angles, the four kinematics outputs and two
+# temporaries inside forward_kinematics, then the stride metrics' masks and
+# shifted copies on top of the two foot arrays
+_TEMPORARIES = 8
+
+
+def sinusoidal_gait(t, duration=2.0, hip_amplitude=15.0, hip_offset=15.0, knee_amplitude=25.0, knee_offset=25.0):
+    """Hip and knee angles (degrees) of the sinusoidal generator at times `t` (s).
+
+    Parameters broadcast against `t`, so e.g. (n_configs x 1) columns give
+    (n_configs x n_frames) trajectories.
+    """
+    phase = np.sin(2 * np.pi * np.asarray(t) / duration)
+    return hip_amplitude * phase + hip_offset, knee_amplitude * phase + knee_offset
+
+
+def _chunk_metrics(phase, hip_amplitude, hip_offset, knee_amplitude, knee_offset, L1, L2):
+    # Angles are built in place, and every frame-sized array is dropped as
+    # soon as it is no longer needed. The metrics are those of gait.strides,
+    # plus the hip height at which the foot just reaches the ground.
+    hip = np.multiply(hip_amplitude, phase)
+    hip += hip_offset
+    np.deg2rad(hip, out=hip)
+    knee = np.multiply(knee_amplitude, phase)
+    knee += knee_offset
+    np.deg2rad(knee, out=knee)
+    positions = forward_kinematics(hip, knee, L1, L2, broadcast=True)
+    del hip, knee
+    foot = positions._replace(knee_x=None, knee_y=None)
+    del positions
+    table = stride_metrics(foot, closed=True)
+    return {
+        "stride_length": table["stride_length"],
+        "foot_clearance": table["foot_clearance"],
+        "stance_fraction": table["stance_fraction"],
+        "reach": -foot.foot_y.min(axis=-1),
+    }
+
+
+def chunk_size(n_frames, memory_budget):
+    """Configurations per chunk so that a chunk's working arrays fit in `memory_budget` bytes."""
+    return max(1, int(memory_budget) // (n_frames * _TEMPORARIES * 8))
+
+
+def sweep(duration=2.0, hip_amplitude=15.0, hip_offset=15.0, knee_amplitude=25.0, knee_offset=25.0,
+          L1=1.0, L2=1.0, n_frames=500, memory_budget=64 * 2 ** 20):
+    """Summary metrics of the generator and the leg kinematics over a Cartesian parameter grid.
+
+    Each parameter is a scalar or a 1-D array of values; the result has one
+    axis per entry of PARAMETERS. The generator's phase over one cycle does
+    not depend on the duration, so trajectories are only evaluated for the
+    other parameters and the duration enters the time-based metrics
+    (`speed`, `cadence`) analytically. `memory_budget` bounds the working
+    arrays of a chunk, not the returned metrics.
+    """
+    axes = {name: np.atleast_1d(np.asarray(value, dtype=float))
+            for name, value in zip(PARAMETERS, (duration, hip_amplitude, hip_offset, knee_amplitude,
+                                                knee_offset, L1, L2))}
+    shape_axes = [axes[name] for name in PARAMETERS[1:]]
+    grid_shape = tuple(len(values) for values in shape_axes)
+    n_configs = int(np.prod(grid_shape))
+
+    # One cycle sampled as in simul_leg_paper.py (endpoint included)
+    phase = np.sin(2 * np.pi * np.linspace(0, 1, n_frames))
+    step = chunk_size(n_frames, memory_budget)
+    metrics = {}
+    for start in range(0, n_configs, step):
+        index = np.unravel_index(np.arange(start, min(start + step, n_configs)), grid_shape)
+        columns = [values[i][:, None] for values, i in zip(shape_axes, index)]
+        for name, value in _chunk_metrics(phase, *columns).items():
+            metrics.setdefault(name, np.empty(n_configs))[start:start + len(value)] = value
+
+    full_shape = (len(axes["duration"]),) + grid_shape
+    duration = axes["duration"].reshape((-1,) + (1,) * len(grid_shape))
+    metrics = {name: np.broadcast_to(value.reshape(grid_shape), full_shape) for name, value in metrics.items()}
+    metrics["speed"] = metrics["stride_length"] / duration
+    metrics["cadence"] = np.broadcast_to(cadence(duration), full_shape)
+    return SweepResult(axes, metrics)
+
+
+def best(result, metric, maximize=True):
+    """Parameter values of the configuration with the best `metric`."""
+    values = result.metrics[metric]
+    flat = np.nanargmax(values) if maximize else np.nanargmin(values)
+    index = np.unravel_index(flat, values.shape)
+    return {name: result.axes[name][i] for name, i in zip(PARAMETERS, index)}
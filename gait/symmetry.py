@@ -0,0 +1,71 @@
+# Contralateral (left/right) symmetry: reconstruct one side, derive the other
+#
+# In normal gait the contralateral joint follows the same trajectory about
+# half a cycle later, so right(t) ~= left(t + offset). Offsets are given as
+# fractions of a cycle.
+import numpy as np
+
+from gait.fourier import FourierCoefficients
+
+
+def estimate_offset(left, right):
+    """Cycle fraction `offset` with right(t) ~= left(t + offset).
+
+    `left`/`right` hold one period of samples on the last axis (without a
+    closing sample); leading axes, e.g. hip and knee, are pooled. The peak
+    of the circular cross-correlation is refined with a parabola, so the
+    offset is not limited to whole samples.
+    """
+    left = np.asarray(left, dtype=float)
+    right = np.asarray(right, dtype=float)
+    n = left.shape[-1]
+    left = left - left.mean(axis=-1, keepdims=True)
+    right = right - right.mean(axis=-1, keepdims=True)
+    spectrum = np.fft.rfft(left, axis=-1) * np.conj(np.fft.rfft(right, axis=-1))
+    xc = np.fft.irfft(spectrum, n, axis=-1).reshape(-1, n).sum(axis=0)
+    peak = int(np.argmax(xc))
+    before, after = xc[peak - 1], xc[(peak + 1) % n]
+    denom = before - 2 * xc[peak] + after
+    refined = peak + (0.5 * (before - after) / denom if denom else 0.0)
+    return (refined / n) % 1.0
+
+
+def shift_cycle(cycle, offset):
+    """Periodic samples `cycle` advanced by `offset` cycles: out(t) = cycle(t + offset).
+
+    Whole-sample offsets are a circular shift; anything else is a phase
+    rotation of the spectrum (exact for band-limited cycles).
+    """
+    cycle = np.asarray(cycle, dtype=float)
+    n = cycle.shape[-1]
+    steps = offset * n
+    if np.isclose(steps, round(steps)):
+        return np.roll(cycle, -int(round(steps)) % n, axis=-1)
+    harmonics = np.arange(n // 2 + 1)
+    spectrum = np.fft.rfft(cycle, axis=-1) * np.exp(2j * np.pi * harmonics * offset)
+    return np.fft.irfft(spectrum, n, axis=-1)
+
+
+def rotate_coefficients(coefficients, offset):
+    """Fourier coefficients of f(t + offset) from those of f(t)."""
+    a0, an, bn = coefficients
+    phase = 2 * np.pi * np.arange(1, np.shape(an)[-1] + 1) * offset
+    cos, sin = np.cos(phase), np.sin(phase)
+    return FourierCoefficients(a0, an * cos + bn * sin, bn * cos - an * sin)
+
+
+def asymmetry_residual(side, other, offset):
+    """RMS difference (degrees) between `other`'s samples and the shifted fit of `side`.
+
+    `side` is a `gait.periodic.PeriodicCycle`; `other` holds the recorded
+    contralateral samples over 0-100% of the cycle (closing sample included).
+    Returns one value per joint.
+    """
+    other = np.asarray(other, dtype=float)[..., :-1]
+    t = np.arange(other.shape[-1]) / other.shape[-1]
+    return np.sqrt(np.mean((other - side(t + offset)) ** 2, axis=-1))
+
+
+def contralateral(side, offset):
+    """The other side's cycle on `side`'s evaluation grid, derived without fitting it."""
+    return shift_cycle(side.cycle, offset)
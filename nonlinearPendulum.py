@@ -1,18 +1,12 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import solve_ivp
+
+from gait.pendulum import pendulum_sweep
 
 # Constants
 g = 9.81  # Acceleration due to gravity (m/s^2)
 L = 1.0   # Length of the pendulum (m)
 
-# Differential equation for the pendulum
-def pendulum_eq(t, y):
-    theta, omega = y
-    dtheta_dt = omega
-    domega_dt = -(g / L) * np.sin(theta)
-    return [dtheta_dt, domega_dt]
-
 # Time span for the simulation
 t_span = (0, 10)
 t_eval = np.linspace(t_span[0], t_span[1], 1000)
@@ -25,12 +19,14 @@ initial_conditions = [
     (np.pi, 0),      # Upside-down position, no initial velocity    
 ]
 
-# Solve and plot phase plane
+# Solve all initial conditions together as one vectorized ensemble (RK45)
+solutions = pendulum_sweep(initial_conditions, t_eval, g, L)
+
+# Plot phase plane
 plt.figure(figsize=(10, 8))
 
-for theta0, omega0 in initial_conditions:
-    sol = solve_ivp(pendulum_eq, t_span, [theta0, omega0], t_eval=t_eval, method='RK45')
-    plt.plot(sol.y[0], sol.y[1], label=f"$\\theta_0={theta0:.2f}, \\omega_0={omega0:.2f}$")
+for (theta0, omega0), y in zip(initial_conditions, solutions):
+    plt.plot(y[0], y[1], label=f"$\\theta_0={theta0:.2f}, \\omega_0={omega0:.2f}$")
 
 # Plot formatting
 plt.title("Phase Plane Plot of Nonlinear Pendulum", fontsize=14)
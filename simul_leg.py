@@ -1,80 +1,50 @@
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.interpolate import CubicSpline
 import matplotlib.animation as animation
 
-# Define signal data for left and right hip and knee flexion (for one cycle)
-left_hip_flexion = [
-    -16.56, -16.82, -16.53, -15.4, -13.44, -10.65, -7.15, -3.16, 0.95, 4.93, 
-    8.63, 11.96, 14.96, 17.62, 19.89, 21.76, 23.24, 24.33, 24.98, 25.26, 
-    25.25, 25.04, 24.8, 24.66, 24.66, 24.7, 24.61, 24.45, 24.13, 23.68, 
-    22.96, 21.78, 20.24, 18.41, 16.38, 14.19, 11.91, 9.58, 7.22, 4.87, 
-    2.57, 0.33, -1.85, -3.98, -6.06, -8.1, -10.06, -11.88, -13.5, -14.85, -15.88
-]
-t_left_hip = np.linspace(0, 1, len(left_hip_flexion))
-
-right_hip_flexion = [
-    24.61, 24.45, 24.13, 23.68, 22.96, 21.78, 20.24, 18.41, 16.38, 14.19, 
-    11.91, 9.58, 7.22, 4.87, 2.57, 0.33, -1.85, -3.98, -6.06, -8.1, -10.06, 
-    -11.88, -13.5, -14.85, -15.88, -16.56, -16.82, -16.53, -15.4, -13.44, 
-    -10.65, -7.15, -3.16, 0.95, 4.93, 8.63, 11.96, 14.96, 17.62, 19.89, 
-    21.76, 23.24, 24.33, 24.98, 25.26, 25.25, 25.04, 24.8, 24.66, 24.66, 24.7
-]
-t_right_hip = np.linspace(0, 1, len(right_hip_flexion))
-
-left_knee_angle = [
-    -8.2, -11.29, -15.19, -20.17, -26.06, -32.67, -39.6, -46.16, -51.68, -55.66, 
-    -57.83, -58.25, -57.28, -55.06, -51.58, -46.99, -41.48, -35.19, -28.31, -21.23, 
-    -14.44, -8.48, -4.3, -2.27, -2.35, -4.14, -3.94, -6.66, -9.45, -12.26, -14.76, 
-    -16.37, -17.04, -16.93, -16.24, -15.15, -13.87, -12.46, -10.95, -9.42, -7.96, 
-    -6.59, -5.37, -4.29, -3.4, -2.72, -2.37, -2.44, -3, -4.08, -5.83, 0
-]
-t_left_knee = np.linspace(0, 1, len(left_knee_angle))
-
-knee_right_angle = [
-    -3.94, -6.66, -9.45, -12.26, -14.76, -16.37, -17.04, -16.93, -16.24, -15.15,
-    -13.87, -12.46, -10.95, -9.42, -7.96, -6.59, -5.37, -4.29, -3.4, -2.72,
-    -2.37, -2.44, -3, -4.08, -5.83, -8.2, -11.29, -15.19, -20.17, -26.06,
-    -32.67, -39.6, -46.16, -51.68, -55.66, -57.83, -58.25, -57.28, -55.06, -51.58,
-    -46.99, -41.48, -35.19, -28.31, -21.23, -14.44, -8.48, -4.3, -2.27, -2.35, -4.14, 0
-]
-t_right_knee = np.linspace(0, 1, len(knee_right_angle))
-
-# Time vector for a single cycle
-t_interp = np.linspace(0, 1, 1000)
-
-# Interpolate data using cubic splines for the first cycle
-cs_left_hip = CubicSpline(t_left_hip, left_hip_flexion)
-cs_right_hip = CubicSpline(t_right_hip, right_hip_flexion)
-cs_left_knee = CubicSpline(t_left_knee, left_knee_angle)
-cs_right_knee = CubicSpline(t_right_knee, knee_right_angle)
-
-# Simulate the first cycle
-reconstructed_left_hip_1 = cs_left_hip(t_interp)
-reconstructed_right_hip_1 = cs_right_hip(t_interp)
-reconstructed_left_knee_1 = cs_left_knee(t_interp)
-reconstructed_right_knee_1 = cs_right_knee(t_interp)
-
-# Reset initial conditions for the second cycle (use the final values of the first cycle)
-cs_left_hip_2 = CubicSpline(t_interp, reconstructed_left_hip_1)
-cs_right_hip_2 = CubicSpline(t_interp, reconstructed_right_hip_1)
-cs_left_knee_2 = CubicSpline(t_interp, reconstructed_left_knee_1)
-cs_right_knee_2 = CubicSpline(t_interp, reconstructed_right_knee_1)
-
-# Simulate the second cycle
-reconstructed_left_hip_2 = cs_left_hip_2(t_interp)
-reconstructed_right_hip_2 = cs_right_hip_2(t_interp)
-reconstructed_left_knee_2 = cs_left_knee_2(t_interp)
-reconstructed_right_knee_2 = cs_right_knee_2(t_interp)
-
-# Combine both cycles for the two-cycle simulation
-reconstructed_left_hip = np.concatenate([reconstructed_left_hip_1, reconstructed_left_hip_2])
-reconstructed_right_hip = np.concatenate([reconstructed_right_hip_1, reconstructed_right_hip_2])
-reconstructed_left_knee = np.concatenate([reconstructed_left_knee_1, reconstructed_left_knee_2])
-reconstructed_right_knee = np.concatenate([reconstructed_right_knee_1, reconstructed_right_knee_2])
+from gait.data import joint_angles
+from gait.kinematics import forward_kinematics, leg_polylines
+from gait.periodic import PeriodicCycle
+from gait.symmetry import asymmetry_residual, contralateral, estimate_offset
+
+# Run with --symmetric to derive the right leg from the left one instead of
+# fitting the recorded right leg
+SYMMETRIC = "--symmetric" in sys.argv
+
+# Sample joint angles for one cycle, split into legs (rows ordered as in gait.data.JOINTS)
+angles = joint_angles()
+left_leg = angles[[0, 2]]  # hip, knee
+right_leg = angles[[1, 3]]
+
+# Fit one periodic cycle per joint (the boundary condition closes the cycle)
+n_cycles = 2
+if SYMMETRIC:
+    gait_cycle = PeriodicCycle(left_leg, n_samples=1000)
+
+    # The right leg repeats the left leg about half a cycle later, so derive it by a
+    # phase shift instead of fitting it, and report how far the recording deviates
+    offset = estimate_offset(left_leg[:, :-1], right_leg[:, :-1])
+    hip_residual, knee_residual = asymmetry_residual(gait_cycle, right_leg, offset)
+    print(f"Right leg offset: {offset:.3f} cycles, asymmetry residual: "
+          f"hip {hip_residual:.2f} deg, knee {knee_residual:.2f} deg")
+
+    left_hip_cycle, left_knee_cycle = gait_cycle.cycle
+    right_hip_cycle, right_knee_cycle = contralateral(gait_cycle, offset)
+else:
+    # Both recorded legs in one periodic fit
+    gait_cycle = PeriodicCycle(np.concatenate([left_leg, right_leg]), n_samples=1000)
+    left_hip_cycle, left_knee_cycle, right_hip_cycle, right_knee_cycle = gait_cycle.cycle
+
+# Repeat the cycle for the multi-cycle simulation without refitting
+reconstructed_left_hip = np.tile(left_hip_cycle, n_cycles)
+reconstructed_right_hip = np.tile(right_hip_cycle, n_cycles)
+reconstructed_left_knee = np.tile(left_knee_cycle, n_cycles)
+reconstructed_right_knee = np.tile(right_knee_cycle, n_cycles)
 
 # Create a larger time vector for the two cycles
-t_interp_two_cycles = np.linspace(0, 2, len(reconstructed_left_hip))
+t_interp_two_cycles = gait_cycle.times(n_cycles)
 
 # Create figure for the angle plot
 fig3, ax3 = plt.subplots(1, 1, figsize=(7, 5))
@@ -108,26 +78,23 @@ def init():
     line_right_knee.set_data([], [])
     return line_left_hip, line_right_hip, line_left_knee, line_right_knee
 
+# Precompute hip/knee/foot points for every frame of one cycle of both legs (left, right)
+leg_positions = forward_kinematics(
+    [left_hip_cycle, right_hip_cycle], [left_knee_cycle, right_knee_cycle], degrees=True
+)
+leg_x, leg_y = leg_polylines(leg_positions)
+
 # Function to update the animation
 def update(frame):
-    # Update the position of the left leg (double pendulum)
-    hip_left_x = np.sin(np.radians(reconstructed_left_hip[frame]))
-    hip_left_y = -np.cos(np.radians(reconstructed_left_hip[frame]))
-    knee_left_x = hip_left_x + np.sin(np.radians(reconstructed_left_knee[frame]))
-    knee_left_y = hip_left_y - np.cos(np.radians(reconstructed_left_knee[frame]))
-
-    # Update the position of the right leg (double pendulum)
-    hip_right_x = np.sin(np.radians(reconstructed_right_hip[frame]))
-    hip_right_y = -np.cos(np.radians(reconstructed_right_hip[frame]))
-    knee_right_x = hip_right_x + np.sin(np.radians(reconstructed_right_knee[frame]))
-    knee_right_y = hip_right_y - np.cos(np.radians(reconstructed_right_knee[frame]))
-
-    # Plot the updated positions
-    line_left_hip.set_data([0, hip_left_x], [0, hip_left_y])
-    line_left_knee.set_data([hip_left_x, knee_left_x], [hip_left_y, knee_left_y])
-
-    line_right_hip.set_data([0, hip_right_x], [0, hip_right_y])
-    line_right_knee.set_data([hip_right_x, knee_right_x], [hip_right_y, knee_right_y])
+    # Later cycles reuse the same precomputed frames
+    frame = frame % gait_cycle.n_samples
+
+    # Thigh is hip -> knee, shin is knee -> foot
+    line_left_hip.set_data(leg_x[0, frame, :2], leg_y[0, frame, :2])
+    line_left_knee.set_data(leg_x[0, frame, 1:], leg_y[0, frame, 1:])
+
+    line_right_hip.set_data(leg_x[1, frame, :2], leg_y[1, frame, :2])
+    line_right_knee.set_data(leg_x[1, frame, 1:], leg_y[1, frame, 1:])
 
     return line_left_hip, line_right_hip, line_left_knee, line_right_knee
 
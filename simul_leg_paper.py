@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
+from gait.sweep import sinusoidal_gait
+
 # Constants for the hip and knee (representing the leg)
 l1 = 1.0  # Length of the thigh (hip to knee)
 l2 = 1.0  # Length of the shin (knee to foot)
@@ -14,8 +16,10 @@ t_eval = np.linspace(0, gait_duration, 500)  # Time points for the gait cycle
 
 # Angular motion formulas (hip and knee angles)
 # The angle oscillates for both hip (thigh) and knee (shin)
-theta_dh = 15 * np.sin(omega * t_eval) + 15  # Hip angle oscillates between -15° and +15°
-theta_dk = 25 * np.sin(omega * t_eval) + 25  # Knee angle oscillates between 0° and 50°
+# (gait.sweep.sweep evaluates the same generator over whole parameter grids)
+theta_dh, theta_dk = sinusoidal_gait(t_eval, gait_duration,
+                                     hip_amplitude=15, hip_offset=15,    # Hip angle oscillates between 0° and 30°
+                                     knee_amplitude=25, knee_offset=25)  # Knee angle oscillates between 0° and 50°
 
 # Convert angles to radians for calculation
 theta_dh_rad = np.radians(theta_dh)